@@ -0,0 +1,228 @@
+"""Answer many electricity questions from one market snapshot.
+
+Scheduled reports ask dozens of questions at once. ``query_many`` opens a
+single data context, fetches only the endpoints the batch needs (once, in
+parallel), answers simple lookups - a region's price, a fuel's share, the
+renewable percentage, carbon intensity, active alerts - straight from the snapshot, and
+sends everything else to pooled agents with bounded parallelism. Because
+LLM questions run inside the same context, their tools reuse the snapshot.
+"""
+import asyncio
+import logging
+import re
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from agents.pool import AgentPool
+from tools.alerts import get_alert_engine, refresh_alert_engine
+from tools.data_context import DataContext, data_context
+from tools.snapshots import FUEL_TYPES, REGIONS
+
+logger = logging.getLogger(__name__)
+
+# Only questions phrased as a lookup of the current value are answered locally
+_LOOKUP = re.compile(
+    r"^(what|what's|whats|how much|how many|show|list|give|tell)\b|"
+    r"\b(current|currently|right now|at the moment)\b"
+)
+# Questions that need reasoning rather than a lookup
+_NEEDS_LLM = re.compile(
+    r"\b(why|how come|compare|compared|versus|vs|trend|forecast|predict|will|should|explain|"
+    r"history|historical|yesterday|week|month|year|chart|plot)\b"
+)
+# Direction, forecasts and extremes across regions or fuels aren't lookups either
+_NOT_LOOKUP = re.compile(
+    r"\b(go(es|ing)? (up|down)|ris(e|es|ing)|fall(s|ing)?|drop(s|ping)?|increas\w*|decreas\w*|"
+    r"expect\w*|tonight|tomorrow|this evening|later|next|"
+    r"which|cheap\w*|expensive|high\w*|low\w*|most|least|maximum|minimum|peak\w*)\b"
+)
+# Spike and alert questions are answered from the alert engine's state
+_ALERT = re.compile(r"\b(spik\w*|surg\w*|alerts?|warnings?)\b")
+
+ALERTS = "alerts"
+_FUEL = re.compile(r"\b(" + "|".join(FUEL_TYPES) + r")\b")
+_REGION = re.compile(r"\b(" + "|".join(region.lower() for region in REGIONS) + r")\b")
+_PRICE = re.compile(r"\b(price|prices|spot|cost)\b")
+_RENEWABLE = re.compile(r"\brenewables?\b")
+_CARBON = re.compile(r"\b(carbon|emissions?|intensity|co2)\b")
+_TOTAL_GENERATION = re.compile(r"\b(total|current)\b.*\b(generation|power)\b|\b(generation|power)\b.*\btotal\b")
+
+
+@dataclass
+class QueryResult:
+    """Answer to one question in a batch."""
+
+    question: str
+    answer: str
+    source: str  # "template" or "llm"
+    elapsed_ms: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the JSON-ready result."""
+        return asdict(self)
+
+
+Renderer = Callable[[DataContext], str]
+
+
+def _region_price(region: str) -> Renderer:
+    def render(context: DataContext) -> str:
+        prices = context.price_snapshot()
+        price = prices.get(region)
+        if price is None:
+            raise KeyError(region)
+        return f"The current spot price in {region} is ${price:.2f}/MWh (as of {prices.timestamp})."
+    return render
+
+
+def _all_prices(context: DataContext) -> str:
+    prices = context.price_snapshot()
+    lines = "\n".join(
+        f"- {region}: ${price:.2f}/MWh" for region, price in zip(prices.regions, prices.prices)
+    )
+    return f"Current spot prices (as of {prices.timestamp}):\n{lines}\n\n**Average**: ${prices.average():.2f}/MWh"
+
+
+def _fuel_share(fuel_type: str) -> Renderer:
+    def render(context: DataContext) -> str:
+        generation = context.generation_snapshot()
+        if fuel_type not in generation.fuel_types:
+            raise KeyError(fuel_type)
+        return (
+            f"{fuel_type.capitalize()} is generating {generation.get(fuel_type):g} MW, "
+            f"{generation.percentage(fuel_type)}% of total generation (as of {generation.timestamp})."
+        )
+    return render
+
+
+def _renewable(context: DataContext) -> str:
+    return f"Renewable sources currently supply {context.renewable_percentage()}% of New Zealand's generation."
+
+
+def _carbon(context: DataContext) -> str:
+    emissions = context.emissions_snapshot()
+    return (
+        f"Current carbon intensity is {emissions.carbon_intensity_gco2_kwh} gCO₂/kWh, "
+        f"with total emissions of {emissions.total_emissions_tonnes_per_hour} tonnes/hour (as of {emissions.timestamp})."
+    )
+
+
+def _total_generation(context: DataContext) -> str:
+    generation = context.generation_snapshot()
+    return f"Total generation is currently {generation.total_generation_mw} MW (as of {generation.timestamp})."
+
+
+def _alerts(context: DataContext) -> str:
+    return get_alert_engine().context_text()
+
+
+def _prefetch(context: DataContext, endpoint: str):
+    """Fetch what a template needs; the alert engine fetches only when behind."""
+    if endpoint == ALERTS:
+        return refresh_alert_engine(context)
+    return getattr(context, endpoint)()
+
+
+def match_template(question: str) -> Optional[Tuple[str, Renderer]]:
+    """
+    Match a question that can be answered directly from a snapshot.
+
+    Args:
+        question: User question
+
+    Returns:
+        Tuple of (data context method to prefetch, or ``ALERTS``, renderer),
+        or None if the question needs the LLM
+    """
+    text = question.lower().strip()
+    if _NEEDS_LLM.search(text):
+        return None
+    if _ALERT.search(text):
+        return ALERTS, _alerts
+    if not _LOOKUP.search(text) or _NOT_LOOKUP.search(text):
+        return None
+
+    fuels = set(_FUEL.findall(text))
+    regions = set(_REGION.findall(text))
+    intents = []
+
+    if _PRICE.search(text):
+        if len(regions) == 1:
+            region = next(name for name in REGIONS if name.lower() in regions)
+            intents.append(("spot_prices", _region_price(region)))
+        elif not regions:
+            intents.append(("spot_prices", _all_prices))
+    if len(fuels) == 1:
+        intents.append(("generation", _fuel_share(fuels.pop())))
+    elif _RENEWABLE.search(text):
+        intents.append(("generation", _renewable))
+    if _CARBON.search(text):
+        intents.append(("carbon_emissions", _carbon))
+    if not intents and _TOTAL_GENERATION.search(text):
+        intents.append(("generation", _total_generation))
+
+    # Anything matching several intents (or none) goes to the LLM
+    return intents[0] if len(intents) == 1 else None
+
+
+async def query_many(
+    questions: Sequence[str],
+    pool: AgentPool,
+    max_concurrency: Optional[int] = None
+) -> List[QueryResult]:
+    """
+    Answer many questions from a single market snapshot.
+
+    Args:
+        questions: Questions to answer
+        pool: Agent pool used for questions that need the LLM
+        max_concurrency: Maximum LLM questions in flight (defaults to the pool size)
+
+    Returns:
+        One QueryResult per question, in the same order
+    """
+    templates = [match_template(question) for question in questions]
+    results: List[Optional[QueryResult]] = [None] * len(questions)
+    semaphore = asyncio.Semaphore(max_concurrency or pool.size)
+
+    async def ask_llm(index: int):
+        async with semaphore:
+            started = time.perf_counter()
+            async with pool.acquire() as agent:
+                answer = await agent.query(questions[index])
+            results[index] = QueryResult(
+                questions[index], answer, "llm", round((time.perf_counter() - started) * 1000, 1)
+            )
+
+    with data_context() as context:
+        # Fetch each endpoint the templates need once, in parallel
+        endpoints = sorted({template[0] for template in templates if template is not None})
+        fetched = await asyncio.gather(
+            *(asyncio.to_thread(_prefetch, context, endpoint) for endpoint in endpoints),
+            return_exceptions=True
+        )
+        failed = {endpoint for endpoint, value in zip(endpoints, fetched) if isinstance(value, Exception)}
+
+        llm_indexes = []
+        for index, template in enumerate(templates):
+            if template is None or template[0] in failed:
+                llm_indexes.append(index)
+                continue
+            started = time.perf_counter()
+            try:
+                answer = template[1](context)
+            except (KeyError, ValueError, TypeError, ZeroDivisionError):
+                llm_indexes.append(index)
+                continue
+            results[index] = QueryResult(
+                questions[index], answer, "template", round((time.perf_counter() - started) * 1000, 1)
+            )
+
+        logger.info(
+            f"📦 Batch of {len(questions)}: {len(questions) - len(llm_indexes)} from snapshot, "
+            f"{len(llm_indexes)} sent to agent"
+        )
+        await asyncio.gather(*(ask_llm(index) for index in llm_indexes))
+
+    return results
@@ -1,79 +1,245 @@
 """Strands Agent for electricity data queries."""
-import os
+import hashlib
+import json
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator, List, Optional, Sequence
 from strands import Agent, tool
+from config import get_settings
+from agents.batch import QueryResult, query_many
+from agents.pool import AgentPool
+from agents.usage import TurnUsage, UsageRecorder
+from tools.alerts import get_alert_engine, refresh_alert_engine
+from tools.charts import chart_for_question
+from tools.data_context import data_context, get_data_context
+from tools.forecast import get_forecaster
+from tools.history import get_market_history
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
-from tools.electricity_api import (
-    get_current_generation,
-    get_spot_prices,
-    get_renewable_percentage,
-    get_carbon_emissions,
-    get_generation_by_fuel_type
-)
 
 
-# Define tools using strands decorator
+# Define tools using strands decorator. Each tool reads through the turn's
+# data context so tools used together in one turn share a single fetch.
 @tool
 def fetch_current_generation() -> Dict[str, Any]:
     """Get current power generation in New Zealand."""
-    return get_current_generation()
+    return get_data_context().generation()
 
 
 @tool
 def fetch_spot_prices() -> Dict[str, Any]:
     """Get current electricity spot prices by region."""
-    return get_spot_prices()
+    return get_data_context().spot_prices()
 
 
 @tool  
 def calculate_renewable_percentage() -> float:
     """Calculate current renewable energy percentage."""
-    generation_data = get_current_generation()
-    return get_renewable_percentage(generation_data)
+    return get_data_context().renewable_percentage()
 
 
 @tool
 def fetch_carbon_emissions() -> Dict[str, Any]:
     """Get current carbon emissions data."""
-    return get_carbon_emissions()
+    return get_data_context().carbon_emissions()
 
 
 @tool
 def fetch_generation_breakdown() -> Dict[str, Any]:
     """Get detailed generation breakdown by fuel type with percentages."""
-    return get_generation_by_fuel_type()
+    return get_data_context().generation_breakdown()
+
+
+@tool
+def fetch_market_alerts() -> Dict[str, Any]:
+    """Get active price-spike and low-renewables alerts for the NZ market."""
+    # Fetches only if the engine hasn't seen this trading period's data yet
+    engine = refresh_alert_engine(get_data_context())
+    return {
+        "alerts": [alert.to_dict() for alert in engine.active_alerts()],
+        "summary": engine.context_text()
+    }
+
+
+@tool
+def fetch_price_forecast() -> Dict[str, Any]:
+    """Get forecasts for the next trading periods: spot prices by region, generation by fuel type and demand."""
+    forecaster = get_forecaster()
+    table = forecaster.table()
+    if not table or not table["prices"]:
+        # No price history yet: seed it with the current snapshot
+        context = get_data_context()
+        context.spot_prices()
+        context.generation()
+        table = forecaster.table()
+    return table or {"error": "Not enough market history to forecast yet."}
+
+
+# The system prompt and tool list form the prompt prefix sent with every model
+# call. Both are fixed at import time (no timestamps or live data) so the
+# prefix is byte-identical across calls and agents and can be served from the
+# provider's prompt cache; live figures only ever arrive through tool results.
+SYSTEM_PROMPT = """You are an expert on New Zealand electricity data.
+Help users understand electricity generation, pricing, and emissions data.
+Provide clear, concise answers with relevant numbers and insights.
+When asked about current data, use the available tools to fetch real-time information.
+Format monetary values with $ and include units (MW for power, $/MWh for prices).
+
+New Zealand market context:
+- The wholesale market settles in 48 half-hour trading periods per day (NZ time).
+  Trading period 1 starts at midnight; daylight-saving changeover days have 46 or 50 periods.
+- Spot prices are reported in $/MWh for the Auckland, Wellington, Christchurch and Dunedin regions.
+- Generation is reported in MW by fuel type: hydro, wind, geothermal, gas and solar.
+- Hydro, geothermal, wind and solar are renewable; renewables typically supply 80-90% of generation.
+- Carbon intensity is reported in gCO2/kWh and rises when gas generation increases.
+- Spot prices spike when demand is high, hydro storage is low or renewable output drops.
+
+Market structure:
+- The Electricity Authority regulates the market. Transpower owns the national grid and acts as
+  system operator, dispatching generation every trading period to meet demand at least cost.
+- Generators submit offers and prices are set at hundreds of grid nodes (nodal pricing), so prices
+  differ between regions because of transmission losses and constraints.
+- Otahuhu (Auckland) and Benmore (South Island) are the usual North and South Island reference nodes.
+- The HVDC link between Benmore and Haywards (Wellington) carries power between the islands, usually
+  north towards the larger North Island load; when it is constrained, island prices separate.
+
+Generation fleet:
+- Hydro is the largest source, most of it in the South Island (Waitaki, Clutha and Manapouri schemes)
+  plus the Waikato river in the North Island. Lake storage covers only weeks of demand, so dry
+  autumns and winters with low inflows push prices up.
+- Geothermal stations in the central North Island (Taupo Volcanic Zone) run steadily as baseload.
+- Wind farms in the Manawatu, Wellington and Southland vary with the weather; solar is a small but
+  growing share and only generates in daylight.
+- Thermal plant, chiefly the Huntly power station (gas and coal) and gas peakers, covers peaks, dry
+  years and low-wind periods. More thermal generation means higher emissions and usually higher prices.
+
+Demand patterns:
+- National demand typically ranges from about 4,000 MW overnight to 7,000 MW on cold winter evenings.
+- Demand peaks on weekday mornings and evenings and is highest in winter (June to August).
+- The Tiwai Point aluminium smelter near Bluff uses about a tenth of national demand.
+
+Interpreting the data:
+- Typical spot prices are roughly $50-300/MWh; prices far above the recent level are price spikes.
+- A renewable share below 80% is unusually low and usually means more gas and coal generation.
+- Carbon intensity is typically 50-150 gCO2/kWh, rising as thermal generation increases.
+- Compare the latest figures with these typical ranges when explaining whether something is unusual.
+
+Choosing tools:
+- Current generation or fuel mix: fetch_current_generation or fetch_generation_breakdown.
+- Prices by region: fetch_spot_prices. Renewable share: calculate_renewable_percentage.
+- Emissions or carbon intensity: fetch_carbon_emissions.
+- Spikes or unusual conditions: fetch_market_alerts. Questions about the coming hours: fetch_price_forecast.
+- Several tools may be used in one answer; they share a single snapshot of market data per question.
+- Never guess current figures; if a tool returns an error, say the data is unavailable."""
+
+TOOLS = (
+    fetch_current_generation,
+    fetch_spot_prices,
+    calculate_renewable_percentage,
+    fetch_carbon_emissions,
+    fetch_generation_breakdown,
+    fetch_market_alerts,
+    fetch_price_forecast
+)
+
+# Bedrock cache point type placed after the system prompt and the tool specs
+PROMPT_CACHE_TYPE = "default"
+# Claude models on Bedrock ignore cache points on prefixes shorter than this
+MIN_CACHEABLE_PREFIX_TOKENS = 1024
+# Conservative (high) characters per token, so estimates err on the small side
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in ``text`` (an underestimate for English and JSON)."""
+    return len(text) // CHARS_PER_TOKEN
+
+
+def prefix_token_estimates() -> Dict[str, int]:
+    """
+    Estimate the size of the cacheable prompt prefix.
+    
+    Returns:
+        Dict of estimated "tools" tokens and "prompt" tokens (tools plus the
+        system prompt, which is what the system prompt's cache point covers)
+    """
+    tools = estimate_tokens(json.dumps([t.tool_spec for t in TOOLS], sort_keys=True))
+    return {"tools": tools, "prompt": tools + estimate_tokens(SYSTEM_PROMPT)}
+
+
+def create_model():
+    """
+    Create the model for the agent, with prompt caching when enabled.
+    
+    Returns:
+        A BedrockModel marking the prompt prefix as cacheable, or the model id
+        (Strands' default Bedrock model) when caching is off or the prefix is
+        too short for the provider to cache
+    """
+    settings = get_settings()
+    if not settings.prompt_caching:
+        return settings.model_id
+    
+    estimates = prefix_token_estimates()
+    if estimates["prompt"] < MIN_CACHEABLE_PREFIX_TOKENS:
+        logger.warning(
+            f"⚠️ Prompt prefix is about {estimates['prompt']} tokens, below the "
+            f"{MIN_CACHEABLE_PREFIX_TOKENS}-token caching minimum; prompt caching disabled"
+        )
+        return settings.model_id
+    
+    from strands.models import BedrockModel
+    
+    # A cache point on the tools alone only helps if they reach the minimum themselves;
+    # the system prompt's cache point covers the tools either way
+    cache_tools = PROMPT_CACHE_TYPE if estimates["tools"] >= MIN_CACHEABLE_PREFIX_TOKENS else None
+    return BedrockModel(
+        model_id=settings.model_id,
+        cache_prompt=PROMPT_CACHE_TYPE,
+        cache_tools=cache_tools
+    )
 
 
 class ElectricityAgent:
     """Agent for handling electricity data queries."""
     
-    def __init__(self):
+    def __init__(self, model: Optional[Any] = None):
         self.agent = None
-        self.tools = [
-            fetch_current_generation,
-            fetch_spot_prices,
-            calculate_renewable_percentage,
-            fetch_carbon_emissions,
-            fetch_generation_breakdown
-        ]
+        self.model = model
+        self.tools = list(TOOLS)
+        self.usage = UsageRecorder()
     
     async def initialize(self):
         """Initialize the agent with tools."""
+        get_alert_engine()
+        get_forecaster()
         self.agent = Agent(
-            model="claude-3-5-sonnet-20241022",
+            model=self.model if self.model is not None else create_model(),
             tools=self.tools,
-            system_prompt="""You are an expert on New Zealand electricity data. 
-            Help users understand electricity generation, pricing, and emissions data.
-            Provide clear, concise answers with relevant numbers and insights.
-            When asked about current data, use the available tools to fetch real-time information.
-            Format monetary values with $ and include units (MW for power, $/MWh for prices)."""
+            system_prompt=SYSTEM_PROMPT,
+            callback_handler=self.usage
+        )
+    
+    @property
+    def last_usage(self) -> TurnUsage:
+        """Token usage of the most recent turn, split into cached and uncached input."""
+        return self.usage.turn
+    
+    def prefix_fingerprint(self) -> str:
+        """
+        Hash the prompt prefix (system prompt and tool specs) sent to the model.
+        
+        Agents with the same fingerprint share prompt cache entries.
+        """
+        tool_specs = self.agent.tool_registry.get_all_tool_specs() if self.agent else [t.tool_spec for t in self.tools]
+        prefix = json.dumps({"system": SYSTEM_PROMPT, "tools": tool_specs}, sort_keys=True)
+        return hashlib.sha256(prefix.encode("utf-8")).hexdigest()
+    
+    def _log_usage(self):
+        usage = self.usage.turn
+        logger.info(
+            f"🧮 Turn usage: {usage.cache_read_input_tokens} cached / "
+            f"{usage.input_tokens + usage.cache_write_input_tokens} uncached input tokens "
+            f"({usage.cache_write_input_tokens} written to cache), {usage.output_tokens} output tokens"
         )
     
     async def execute_tool(self, tool_name: str, **kwargs) -> Any:
@@ -83,7 +249,9 @@ class ElectricityAgent:
             "get_spot_prices": fetch_spot_prices,
             "calculate_renewable_percentage": calculate_renewable_percentage,
             "get_carbon_emissions": fetch_carbon_emissions,
-            "get_generation_breakdown": fetch_generation_breakdown
+            "get_generation_breakdown": fetch_generation_breakdown,
+            "get_market_alerts": fetch_market_alerts,
+            "get_price_forecast": fetch_price_forecast
         }
         
         if tool_name in tool_map:
@@ -100,7 +268,10 @@ class ElectricityAgent:
         
         try:
             logger.info("📤 Sending query to agent...")
-            response = await self.agent.invoke_async(question)
+            self.usage.start_turn()
+            with data_context():
+                response = await self.agent.invoke_async(question)
+            self._log_usage()
             result = response.content if hasattr(response, 'content') else str(response)
             logger.info(f"✅ Agent response: {result}")
             return result
@@ -110,6 +281,49 @@ class ElectricityAgent:
             logger.error(f"📋 Full traceback: {traceback.format_exc()}")
             return f"I'm sorry, I encountered an error while processing your request. Please try again later."
 
+    
+    async def respond(self, question: str) -> Dict[str, Any]:
+        """Answer a question, attaching a chart when it asks to see data over time."""
+        content = await self.query(question)
+        return {"content": content, "chart": chart_for_question(question, get_market_history())}
+    
+    async def stream(self, question: str) -> AsyncIterator[str]:
+        """Process a user query and yield the response text as it is generated."""
+        logger.info(f"🤖 Agent received streaming query: {question}")
+        
+        if not self.agent:
+            logger.info("🔧 Initializing agent...")
+            await self.initialize()
+        
+        try:
+            self.usage.start_turn()
+            with data_context():
+                async for event in self.agent.stream_async(question):
+                    if "data" in event:
+                        yield event["data"]
+            self._log_usage()
+        except Exception as e:
+            logger.error(f"❌ Agent streaming error: {str(e)}")
+            yield "I'm sorry, I encountered an error while processing your request. Please try again later."
+    
+    async def query_many(self, questions: Sequence[str], max_concurrency: int = 4) -> List[QueryResult]:
+        """
+        Answer many questions from one market snapshot.
+        
+        Simple lookups are answered from the snapshot; the rest run on fresh
+        agents (so this agent's conversation is untouched), at most
+        ``max_concurrency`` at a time.
+        
+        Returns:
+            One QueryResult per question, in order
+        """
+        return await query_many(questions, AgentPool(create_electricity_agent, max_concurrency))
+    
+    def reset(self):
+        """Clear conversation history so the agent can serve an unrelated request."""
+        if self.agent is not None:
+            self.agent.messages.clear()
+
 
 async def create_electricity_agent() -> ElectricityAgent:
     """Create and initialize an electricity agent."""
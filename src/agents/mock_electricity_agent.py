@@ -1,19 +1,14 @@
 """Mock Strands Agent for electricity data queries - works without AWS Bedrock."""
 import logging
-from typing import Dict, Any
-from tools.electricity_api import (
-    get_current_generation,
-    get_spot_prices,
-    get_renewable_percentage,
-    get_carbon_emissions,
-    get_generation_by_fuel_type
-)
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+from typing import Dict, Any, AsyncIterator, List, Sequence
+from agents.batch import QueryResult, query_many
+from agents.pool import AgentPool
+from tools.alerts import get_alert_engine, refresh_alert_engine
+from tools.charts import chart_for_question
+from tools.data_context import data_context
+from tools.forecast import get_forecaster
+from tools.history import get_market_history
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,6 +21,8 @@ class MockElectricityAgent:
     async def initialize(self):
         """Initialize the mock agent."""
         logger.info("🔧 Initializing mock electricity agent...")
+        get_alert_engine()
+        get_forecaster()
         self.initialized = True
         logger.info("✅ Mock agent initialized successfully")
     
@@ -37,17 +34,28 @@ class MockElectricityAgent:
             await self.initialize()
         
         try:
-            # Get real electricity data
-            generation_data = get_current_generation()
-            spot_data = get_spot_prices()
-            renewable_pct = get_renewable_percentage(generation_data)
-            emissions_data = get_carbon_emissions()
-            fuel_breakdown = get_generation_by_fuel_type()
-            
-            # Generate response based on question type
             question_lower = question.lower()
             
-            if "generation" in question_lower or "power" in question_lower:
+            if "spik" in question_lower or "alert" in question_lower:
+                # Answered from the alert engine, which only fetches once per trading period
+                with data_context() as context:
+                    response = self._alert_response(refresh_alert_engine(context))
+                logger.info(f"✅ Mock agent response generated ({len(response)} chars)")
+                return response
+            
+            # Get real electricity data, one fetch per endpoint
+            with data_context() as context:
+                generation_data = context.generation()
+                spot_data = context.spot_prices()
+                renewable_pct = context.renewable_percentage()
+                emissions_data = context.carbon_emissions()
+                fuel_breakdown = context.generation_breakdown()
+            
+            # Generate response based on question type
+            if any(word in question_lower for word in ("forecast", "predict", "will", "go up", "go down")):
+                response = self._forecast_response()
+
+            elif "generation" in question_lower or "power" in question_lower:
                 response = f"""Based on current New Zealand electricity data:
 
 **Total Generation**: {generation_data['total_generation_mw']} MW
@@ -126,6 +134,63 @@ Feel free to ask about specific aspects like generation, prices, or renewable en
         except Exception as e:
             logger.error(f"❌ Mock agent error: {str(e)}")
             return "I'm sorry, I encountered an error while processing your request. Please try again later."
+    
+    def _alert_response(self, engine) -> str:
+        """Describe active market alerts from the alert engine's state."""
+        return f"""{engine.context_text()}
+
+Data timestamp: {engine.last_checked()}"""
+    
+    def _forecast_response(self) -> str:
+        """Describe the precomputed price and demand forecast."""
+        table = get_forecaster().table()
+        if not table or not table["prices"]:
+            return "I don't have enough market history to forecast yet. Please ask again later."
+        
+        lines = []
+        for region, series in table["prices"].items():
+            final = series["values"][-1]
+            if series["last_value"] is None or final is None:
+                continue
+            change = final - series["last_value"]
+            direction = "rise" if change > 0.5 else "fall" if change < -0.5 else "stay flat"
+            lines.append(f"- {region}: ${series['last_value']:.2f} → ${final:.2f}/MWh (expected to {direction})")
+        
+        demand = table["demand"]
+        demand_line = ""
+        if demand and demand["values"][-1] is not None:
+            demand_line = f"\n\n**Demand**: {demand['last_value']:.0f} MW now, about {demand['values'][-1]:.0f} MW by {demand['periods'][-1]}"
+        
+        first_series = next(iter(table["prices"].values()))
+        price_lines = "\n".join(lines)
+        return f"""Spot price forecast for the next {table['horizon_periods']} trading periods:
+
+**Regional Prices**:
+{price_lines}{demand_line}
+
+Forecast method: {first_series['method'].replace('_', '-')}, from {first_series['history_periods']} trading period(s) of history."""
+    
+    async def respond(self, question: str) -> Dict[str, Any]:
+        """Answer a question, attaching a chart when it asks to see data over time."""
+        content = await self.query(question)
+        return {"content": content, "chart": chart_for_question(question, get_market_history())}
+    
+    async def stream(self, question: str) -> AsyncIterator[str]:
+        """Process a user query and yield the response paragraph by paragraph."""
+        response = await self.query(question)
+        paragraphs = response.split("\n\n")
+        for index, paragraph in enumerate(paragraphs):
+            yield paragraph if index == len(paragraphs) - 1 else paragraph + "\n\n"
+    
+    async def query_many(self, questions: Sequence[str], max_concurrency: int = 4) -> List[QueryResult]:
+        """Answer many questions from one market snapshot (see ``agents.batch``)."""
+        async def shared_agent():
+            return self
+        
+        return await query_many(questions, AgentPool(shared_agent, max_concurrency))
+    
+    def reset(self):
+        """Clear per-conversation state (the mock agent keeps none)."""
 
 
 async def create_mock_electricity_agent() -> MockElectricityAgent:
@@ -0,0 +1,100 @@
+"""Pool of initialized electricity agents shared by headless clients.
+
+Agents keep conversation state, so one instance must not serve two requests
+at once. The pool hands out an agent per request, resets it when the request
+finishes and caps how many agents are ever created.
+"""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional
+
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+AgentFactory = Callable[[], Awaitable[Any]]
+
+_shared_pool: Optional["AgentPool"] = None
+
+
+async def create_agent_for_backend(backend: str) -> Any:
+    """
+    Create and initialize an agent for the configured backend.
+
+    Args:
+        backend: "strands" for the Bedrock-backed agent, "mock" for the offline agent
+
+    Returns:
+        An initialized ElectricityAgent or MockElectricityAgent
+    """
+    if backend == "strands":
+        from agents.electricity_agent import create_electricity_agent
+        return await create_electricity_agent()
+    if backend == "mock":
+        from agents.mock_electricity_agent import create_mock_electricity_agent
+        return await create_mock_electricity_agent()
+    raise ValueError(f"Unknown agent backend: {backend}")
+
+
+class AgentPool:
+    """Fixed-size pool of lazily created agents."""
+
+    def __init__(self, factory: Optional[AgentFactory] = None, size: Optional[int] = None):
+        settings = get_settings()
+        self.factory = factory or (lambda: create_agent_for_backend(settings.agent_backend))
+        self.size = size or settings.agent_pool_size
+        self._idle: List[Any] = []
+        self._created = 0
+        self._available: Optional[asyncio.Condition] = None
+
+    @property
+    def created(self) -> int:
+        """Number of agents created so far."""
+        return self._created
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Any]:
+        """
+        Check out an agent for the duration of one request.
+
+        Waits for an agent to be released when all ``size`` agents are busy.
+
+        Yields:
+            An initialized agent
+        """
+        if self._available is None:
+            self._available = asyncio.Condition()
+
+        async with self._available:
+            while not self._idle and self._created >= self.size:
+                await self._available.wait()
+            agent = self._idle.pop() if self._idle else None
+            if agent is None:
+                self._created += 1
+
+        if agent is None:
+            try:
+                logger.info(f"🔧 Creating pooled agent {self._created}/{self.size}")
+                agent = await self.factory()
+            except Exception:
+                async with self._available:
+                    self._created -= 1
+                    self._available.notify()
+                raise
+
+        try:
+            yield agent
+        finally:
+            agent.reset()
+            async with self._available:
+                self._idle.append(agent)
+                self._available.notify()
+
+
+def get_agent_pool() -> AgentPool:
+    """Return the process-wide agent pool, created on first use."""
+    global _shared_pool
+    if _shared_pool is None:
+        _shared_pool = AgentPool()
+    return _shared_pool
@@ -0,0 +1,71 @@
+"""Per-turn token usage, split into cached and uncached input.
+
+Strands only accumulates input/output totals, but every raw model stream
+chunk reaches the agent's callback handler. ``UsageRecorder`` is that
+handler: it sums the ``metadata.usage`` chunk of each model call in a turn,
+keeping the provider's prompt-cache counters (``cacheReadInputTokens`` and
+``cacheWriteInputTokens``), so we can see how much of each turn's prompt was
+served from cache.
+"""
+from dataclasses import dataclass, asdict
+from typing import Any, Dict
+
+
+@dataclass
+class TurnUsage:
+    """Token usage for one agent turn (all model calls it made)."""
+
+    input_tokens: int = 0
+    cache_read_input_tokens: int = 0
+    cache_write_input_tokens: int = 0
+    output_tokens: int = 0
+    model_calls: int = 0
+
+    @property
+    def total_input_tokens(self) -> int:
+        """Input tokens including those read from or written to the cache."""
+        return self.input_tokens + self.cache_read_input_tokens + self.cache_write_input_tokens
+
+    @property
+    def cached_input_ratio(self) -> float:
+        """Share of input tokens served from the prompt cache."""
+        total = self.total_input_tokens
+        return self.cache_read_input_tokens / total if total else 0.0
+
+    def add(self, usage: Dict[str, Any]):
+        """Add one model call's ``metadata.usage`` payload."""
+        self.input_tokens += usage.get("inputTokens", 0)
+        self.cache_read_input_tokens += usage.get("cacheReadInputTokens", 0)
+        self.cache_write_input_tokens += usage.get("cacheWriteInputTokens", 0)
+        self.output_tokens += usage.get("outputTokens", 0)
+        self.model_calls += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the JSON-ready usage, including derived totals."""
+        return {
+            **asdict(self),
+            "total_input_tokens": self.total_input_tokens,
+            "cached_input_ratio": round(self.cached_input_ratio, 3)
+        }
+
+
+class UsageRecorder:
+    """Strands callback handler that records token usage per turn."""
+
+    def __init__(self):
+        self.turn = TurnUsage()
+        self.totals = TurnUsage()
+
+    def start_turn(self) -> TurnUsage:
+        """Begin recording a new turn."""
+        self.turn = TurnUsage()
+        return self.turn
+
+    def __call__(self, **kwargs: Any):
+        event = kwargs.get("event")
+        if not event or "metadata" not in event:
+            return
+        usage = event["metadata"].get("usage")
+        if usage:
+            self.turn.add(usage)
+            self.totals.add(usage)
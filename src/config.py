@@ -0,0 +1,76 @@
+"""Application settings, loaded once per process.
+
+Modules read configuration through ``get_settings()`` instead of calling
+``load_dotenv()`` and ``logging.basicConfig`` at import time, so importing a
+module stays cheap and ``.env`` is parsed at most once.
+"""
+import os
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+
+# API endpoints (using public em6 data)
+EM6_BASE_URL = "https://api.em6.co.nz/v1"
+EMI_BASE_URL = "https://emi.portal.azure-api.net"
+
+DEFAULT_MODEL_ID = "claude-3-5-sonnet-20241022"
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Runtime configuration for the chatbot."""
+
+    em6_base_url: str = EM6_BASE_URL
+    emi_base_url: str = EMI_BASE_URL
+    http_timeout: float = 10.0
+    model_id: str = DEFAULT_MODEL_ID
+    log_level: str = "INFO"
+    agent_backend: str = "mock"
+    agent_pool_size: int = 4
+    service_max_concurrency: int = 8
+    service_max_batch_size: int = 50
+    service_host: str = "0.0.0.0"
+    service_port: int = 8000
+    prompt_caching: bool = True
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """Build settings from environment variables (after loading ``.env``)."""
+        return cls(
+            em6_base_url=os.getenv("EM6_API_URL", cls.em6_base_url).rstrip("/"),
+            emi_base_url=os.getenv("EMI_API_URL", cls.emi_base_url).rstrip("/"),
+            http_timeout=float(os.getenv("HTTP_TIMEOUT_SECONDS", cls.http_timeout)),
+            model_id=os.getenv("BEDROCK_MODEL_ID", cls.model_id),
+            log_level=os.getenv("LOG_LEVEL", cls.log_level).upper(),
+            agent_backend=os.getenv("ELECTRICITY_AGENT_BACKEND", cls.agent_backend).lower(),
+            agent_pool_size=int(os.getenv("AGENT_POOL_SIZE", cls.agent_pool_size)),
+            service_max_concurrency=int(os.getenv("SERVICE_MAX_CONCURRENCY", cls.service_max_concurrency)),
+            service_max_batch_size=int(os.getenv("SERVICE_MAX_BATCH_SIZE", cls.service_max_batch_size)),
+            service_host=os.getenv("SERVICE_HOST", cls.service_host),
+            service_port=int(os.getenv("SERVICE_PORT", cls.service_port)),
+            prompt_caching=os.getenv("PROMPT_CACHING", "true").lower() not in ("0", "false", "no")
+        )
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Load settings once, reading ``.env`` on first use.
+
+    Returns:
+        The process-wide Settings instance
+    """
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    return Settings.from_env()
+
+
+@lru_cache(maxsize=1)
+def configure_logging() -> None:
+    """Configure root logging once for the process."""
+    logging.basicConfig(
+        level=get_settings().log_level,
+        format=LOG_FORMAT
+    )
@@ -0,0 +1,24 @@
+"""Run the headless query service: ``cd src && python -m service``."""
+import argparse
+
+from config import configure_logging, get_settings
+
+
+def main():
+    """Start the ASGI service with uvicorn."""
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="NZ Electricity Chatbot query service")
+    parser.add_argument("--host", default=settings.service_host)
+    parser.add_argument("--port", type=int, default=settings.service_port)
+    args = parser.parse_args()
+
+    configure_logging()
+
+    import uvicorn
+    from service.server import create_app
+
+    uvicorn.run(create_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""Headless ASGI service exposing electricity agent queries over HTTP.
+
+Programmatic clients (dashboards, bots) call the same agents, tools and data
+context as the Streamlit UI without a browser session or script reruns.
+
+Endpoints:
+    GET  /health        - liveness and pool status
+    POST /query         - {"question": ...} -> {"answer": ..., "elapsed_ms": ...}
+    POST /query/stream  - same request, answer streamed as server-sent events
+    POST /batch         - {"questions": [...]} -> {"results": [...]} in request order
+"""
+import asyncio
+import json
+import logging
+import time
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Dict, Optional
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+from starlette.types import Receive, Scope, Send
+
+from agents.batch import query_many
+from agents.pool import AgentPool, AgentFactory, get_agent_pool
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceBusy(Exception):
+    """Raised when the service is at its concurrency limit and queue is full."""
+
+
+class ConcurrencyLimiter:
+    """Caps in-flight requests and rejects new ones once the wait queue is full."""
+
+    def __init__(self, max_concurrency: int, max_waiting: Optional[int] = None):
+        self.max_concurrency = max_concurrency
+        self.max_waiting = max_concurrency if max_waiting is None else max_waiting
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._waiting = 0
+
+    async def acquire(self):
+        """Wait for a slot, raising ServiceBusy if too many requests are already queued."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        if self._semaphore.locked() and self._waiting >= self.max_waiting:
+            raise ServiceBusy()
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+    def release(self):
+        """Release a slot taken by ``acquire``."""
+        self._semaphore.release()
+
+
+class _SlotStreamingResponse(StreamingResponse):
+    """Streaming response that holds a concurrency slot until it has finished sending."""
+
+    def __init__(self, content: AsyncIterator[str], limiter: ConcurrencyLimiter, **kwargs: Any):
+        super().__init__(content, **kwargs)
+        self.limiter = limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            try:
+                # A client that disconnects leaves the body generator suspended (or
+                # never started); closing it runs its cleanup, returning any pooled agent
+                await self.body_iterator.aclose()
+            finally:
+                self.limiter.release()
+
+
+def _busy_response() -> JSONResponse:
+    return JSONResponse(
+        {"error": "Service is at capacity, please retry shortly."},
+        status_code=503,
+        headers={"Retry-After": "1"}
+    )
+
+
+async def _read_json(request: Request) -> Dict[str, Any]:
+    """Return the request body as a dict, or an empty dict if it isn't valid JSON."""
+    try:
+        body = await request.json()
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return {}
+    return body if isinstance(body, dict) else {}
+
+
+def _question_from(body: Dict[str, Any]) -> Optional[str]:
+    question = body.get("question")
+    if isinstance(question, str) and question.strip():
+        return question.strip()
+    return None
+
+
+async def _answer(pool: AgentPool, question: str) -> Dict[str, Any]:
+    """Answer one question on a pooled agent, with timing."""
+    started = time.perf_counter()
+    async with pool.acquire() as agent:
+        answer = await agent.query(question)
+    return {
+        "question": question,
+        "answer": answer,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+    }
+
+
+def _sse(event: str, payload: Dict[str, Any]) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+async def health(request: Request) -> JSONResponse:
+    """Report liveness and pool usage."""
+    pool: AgentPool = request.app.state.pool
+    return JSONResponse({"status": "ok", "agents_created": pool.created, "pool_size": pool.size})
+
+
+async def query(request: Request) -> JSONResponse:
+    """Answer a single question."""
+    question = _question_from(await _read_json(request))
+    if question is None:
+        return JSONResponse({"error": "Request body must include a non-empty 'question'."}, status_code=400)
+
+    limiter: ConcurrencyLimiter = request.app.state.limiter
+    try:
+        await limiter.acquire()
+    except ServiceBusy:
+        return _busy_response()
+    try:
+        return JSONResponse(await _answer(request.app.state.pool, question))
+    finally:
+        limiter.release()
+
+
+async def query_stream(request: Request):
+    """Answer a single question, streaming text deltas as server-sent events."""
+    question = _question_from(await _read_json(request))
+    if question is None:
+        return JSONResponse({"error": "Request body must include a non-empty 'question'."}, status_code=400)
+
+    limiter: ConcurrencyLimiter = request.app.state.limiter
+    try:
+        await limiter.acquire()
+    except ServiceBusy:
+        return _busy_response()
+
+    pool: AgentPool = request.app.state.pool
+
+    async def events() -> AsyncIterator[str]:
+        started = time.perf_counter()
+        async with pool.acquire() as agent:
+            async with aclosing(agent.stream(question)) as deltas:
+                async for delta in deltas:
+                    yield _sse("delta", {"text": delta})
+        yield _sse("done", {"elapsed_ms": round((time.perf_counter() - started) * 1000, 1)})
+
+    # The slot taken above is released by the response once sending ends,
+    # including when the client disconnects before the first event
+    return _SlotStreamingResponse(
+        events(),
+        limiter,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
+async def batch(request: Request) -> JSONResponse:
+    """Answer many questions from one market snapshot, returning results in request order."""
+    questions = (await _read_json(request)).get("questions")
+    if not isinstance(questions, list) or not questions or not all(
+        isinstance(question, str) and question.strip() for question in questions
+    ):
+        return JSONResponse({"error": "Request body must include a non-empty 'questions' list of strings."}, status_code=400)
+
+    max_batch_size = request.app.state.max_batch_size
+    if len(questions) > max_batch_size:
+        return JSONResponse({"error": f"At most {max_batch_size} questions per batch."}, status_code=413)
+
+    limiter: ConcurrencyLimiter = request.app.state.limiter
+    try:
+        await limiter.acquire()
+    except ServiceBusy:
+        return _busy_response()
+
+    started = time.perf_counter()
+    try:
+        results = await query_many([question.strip() for question in questions], request.app.state.pool)
+    finally:
+        limiter.release()
+
+    return JSONResponse({
+        "results": [result.to_dict() for result in results],
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+    })
+
+
+def create_app(
+    agent_factory: Optional[AgentFactory] = None,
+    pool_size: Optional[int] = None,
+    max_concurrency: Optional[int] = None
+) -> Starlette:
+    """
+    Create the headless query service.
+
+    Args:
+        agent_factory: Async callable returning an initialized agent; defaults to the
+            configured backend via the process-wide agent pool
+        pool_size: Maximum number of agents to create
+        max_concurrency: Maximum number of requests processed at once
+
+    Returns:
+        Starlette ASGI application
+    """
+    settings = get_settings()
+    app = Starlette(routes=[
+        Route("/health", health, methods=["GET"]),
+        Route("/query", query, methods=["POST"]),
+        Route("/query/stream", query_stream, methods=["POST"]),
+        Route("/batch", batch, methods=["POST"]),
+    ])
+    if agent_factory is None and pool_size is None:
+        app.state.pool = get_agent_pool()
+    else:
+        app.state.pool = AgentPool(agent_factory, pool_size)
+    app.state.limiter = ConcurrencyLimiter(max_concurrency or settings.service_max_concurrency)
+    app.state.max_batch_size = settings.service_max_batch_size
+    return app
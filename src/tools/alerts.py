@@ -0,0 +1,264 @@
+"""Incremental price-spike and low-renewables alert engine.
+
+Every newly fetched snapshot is evaluated exactly once, in O(1) per region:
+an exponentially weighted mean and variance per region flags prices well
+above their recent level, and the renewable share is checked against a
+threshold with hysteresis. Alerts are pushed to subscribers (one per
+Streamlit session) and summarised for the agent. Once the engine has seen
+prices and generation during the current trading period, "is the price
+spiking?" is answered from its state without another fetch.
+"""
+import math
+import threading
+import weakref
+from collections import deque
+from dataclasses import dataclass, asdict
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from tools.data_context import DataContext, add_snapshot_listener
+from tools.history import current_trading_period
+from tools.snapshots import GenerationSnapshot, PriceSnapshot
+
+PRICE_SPIKE = "price_spike"
+LOW_RENEWABLES = "low_renewables"
+
+_shared_engine: Optional["AlertEngine"] = None
+_shared_engine_lock = threading.Lock()
+
+
+class EwmaStats:
+    """Exponentially weighted running mean and variance."""
+
+    __slots__ = ("alpha", "mean", "variance", "count")
+
+    def __init__(self, alpha: float):
+        self.alpha = alpha
+        self.mean = 0.0
+        self.variance = 0.0
+        self.count = 0
+
+    def zscore(self, value: float) -> float:
+        """Return how many standard deviations ``value`` is above the running mean."""
+        std = math.sqrt(self.variance)
+        if std == 0:
+            return math.inf if value > self.mean and self.count else 0.0
+        return (value - self.mean) / std
+
+    def update(self, value: float):
+        """Fold ``value`` into the running statistics."""
+        if self.count == 0:
+            self.mean = value
+        else:
+            diff = value - self.mean
+            increment = self.alpha * diff
+            self.mean += increment
+            self.variance = (1 - self.alpha) * (self.variance + diff * increment)
+        self.count += 1
+
+
+@dataclass
+class Alert:
+    """A market condition worth telling users about."""
+
+    kind: str
+    message: str
+    value: float
+    timestamp: Optional[str]
+    region: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the JSON-ready alert."""
+        return asdict(self)
+
+
+class AlertSubscription:
+    """Per-subscriber queue of alerts not yet shown."""
+
+    def __init__(self, maxlen: int = 50):
+        self._pending: Deque[Alert] = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def push(self, alert: Alert):
+        with self._lock:
+            self._pending.append(alert)
+
+    def drain(self) -> List[Alert]:
+        """Return and clear alerts received since the last drain."""
+        with self._lock:
+            alerts = list(self._pending)
+            self._pending.clear()
+        return alerts
+
+
+class AlertEngine:
+    """Evaluates each new snapshot once and pushes alerts to subscribers."""
+
+    def __init__(
+        self,
+        alpha: float = 0.2,
+        spike_sigma: float = 3.0,
+        min_spike_delta: float = 20.0,
+        min_observations: int = 6,
+        renewable_threshold: float = 80.0,
+        renewable_hysteresis: float = 2.0
+    ):
+        self.alpha = alpha
+        self.spike_sigma = spike_sigma
+        self.min_spike_delta = min_spike_delta
+        self.min_observations = min_observations
+        self.renewable_threshold = renewable_threshold
+        self.renewable_hysteresis = renewable_hysteresis
+        self._price_stats: Dict[str, EwmaStats] = {}
+        self._active: Dict[Tuple[str, Optional[str]], Alert] = {}
+        self._last_seen: Dict[type, Optional[str]] = {}
+        self._observed_period: Dict[type, int] = {}
+        self._subscribers: "weakref.WeakSet[AlertSubscription]" = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> AlertSubscription:
+        """
+        Subscribe to new alerts.
+
+        Subscriptions are held weakly, so one stored in a session's state goes
+        away with the session.
+
+        Returns:
+            AlertSubscription to drain on each rerun
+        """
+        subscription = AlertSubscription()
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def observe(self, snapshot: Any) -> List[Alert]:
+        """
+        Evaluate a snapshot unless it was already seen.
+
+        Args:
+            snapshot: PriceSnapshot or GenerationSnapshot (other types are ignored)
+
+        Returns:
+            Alerts raised by this snapshot
+        """
+        with self._lock:
+            snapshot_type = type(snapshot)
+            if snapshot_type not in (PriceSnapshot, GenerationSnapshot):
+                return []
+            self._observed_period[snapshot_type] = current_trading_period()
+            if snapshot.timestamp is not None and self._last_seen.get(snapshot_type) == snapshot.timestamp:
+                return []
+            self._last_seen[snapshot_type] = snapshot.timestamp
+
+            if snapshot_type is PriceSnapshot:
+                alerts = self._observe_prices(snapshot)
+            else:
+                alerts = self._observe_generation(snapshot)
+
+            subscribers = list(self._subscribers)
+
+        for alert in alerts:
+            for subscription in subscribers:
+                subscription.push(alert)
+        return alerts
+
+    def _observe_prices(self, snapshot: PriceSnapshot) -> List[Alert]:
+        alerts = []
+        for region, price in zip(snapshot.regions, snapshot.prices):
+            stats = self._price_stats.get(region)
+            if stats is None:
+                stats = self._price_stats[region] = EwmaStats(self.alpha)
+
+            key = (PRICE_SPIKE, region)
+            spiking = (
+                stats.count >= self.min_observations
+                and price - stats.mean >= self.min_spike_delta
+                and stats.zscore(price) >= self.spike_sigma
+            )
+            if spiking and key not in self._active:
+                alert = Alert(
+                    PRICE_SPIKE,
+                    f"{region} spot price spiked to ${price:.2f}/MWh (recent average ${stats.mean:.2f}/MWh)",
+                    price,
+                    snapshot.timestamp,
+                    region
+                )
+                self._active[key] = alert
+                alerts.append(alert)
+            elif not spiking and key in self._active and price <= stats.mean + math.sqrt(stats.variance):
+                del self._active[key]
+
+            stats.update(price)
+        return alerts
+
+    def _observe_generation(self, snapshot: GenerationSnapshot) -> List[Alert]:
+        share = snapshot.renewable_percentage()
+        key = (LOW_RENEWABLES, None)
+        if share < self.renewable_threshold and key not in self._active:
+            alert = Alert(
+                LOW_RENEWABLES,
+                f"Renewable share dropped to {share}% (threshold {self.renewable_threshold:g}%)",
+                share,
+                snapshot.timestamp
+            )
+            self._active[key] = alert
+            return [alert]
+        if share >= self.renewable_threshold + self.renewable_hysteresis:
+            self._active.pop(key, None)
+        return []
+
+    def is_current(self, now: Optional[float] = None) -> bool:
+        """Return True if prices and generation were both observed during the current trading period."""
+        period = current_trading_period(now)
+        with self._lock:
+            return all(
+                self._observed_period.get(snapshot_type) == period
+                for snapshot_type in (PriceSnapshot, GenerationSnapshot)
+            )
+
+    def last_checked(self) -> Optional[str]:
+        """Return the timestamp of the latest price snapshot evaluated."""
+        with self._lock:
+            return self._last_seen.get(PriceSnapshot)
+
+    def active_alerts(self) -> List[Alert]:
+        """Return alerts whose condition is still in effect."""
+        with self._lock:
+            return list(self._active.values())
+
+    def context_text(self) -> str:
+        """Summarise active alerts for the agent."""
+        alerts = self.active_alerts()
+        if not alerts:
+            return "No active market alerts: prices are within their recent range and renewable share is normal."
+        return "Active market alerts:\n" + "\n".join(f"- {alert.message}" for alert in alerts)
+
+
+def get_alert_engine() -> AlertEngine:
+    """Return the process-wide alert engine, subscribing it to new snapshots on first use."""
+    global _shared_engine
+    with _shared_engine_lock:
+        if _shared_engine is None:
+            _shared_engine = AlertEngine()
+            add_snapshot_listener(_shared_engine.observe)
+        return _shared_engine
+
+
+def refresh_alert_engine(context: DataContext) -> AlertEngine:
+    """
+    Return the shared alert engine, bringing it up to date first if needed.
+
+    Prices and generation are fetched through ``context`` (which feeds them to
+    the engine) only when the engine hasn't seen both during the current
+    trading period, so repeated alert questions cost no fetches.
+
+    Args:
+        context: Data context of the current turn
+
+    Returns:
+        The process-wide AlertEngine
+    """
+    engine = get_alert_engine()
+    if not engine.is_current():
+        context.spot_prices()
+        context.generation()
+    return engine
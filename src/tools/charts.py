@@ -0,0 +1,152 @@
+"""Chart specs for time-series answers, downsampled server-side.
+
+Questions like "show hydro vs wind this week" get a Vega-Lite line chart
+built from the local market history. Each series is reduced with
+Largest-Triangle-Three-Buckets (LTTB) to about one point per horizontal
+pixel, which keeps peaks and troughs while sending the browser a small,
+fixed amount of data however long the history is.
+"""
+import re
+from typing import Any, Dict, List, Optional, Sequence
+
+from tools.history import MarketHistory, PERIODS_PER_DAY, period_start
+from tools.snapshots import FUEL_TYPES, REGIONS
+
+DEFAULT_CHART_WIDTH = 700
+
+_CHART_WORDS = re.compile(r"\b(chart|plot|graph|show|trend|history|over time|vs|versus|compare|today|week)\b")
+_PRICE_WORDS = re.compile(r"\b(price|prices|spot)\b")
+_FUEL = re.compile(r"\b(" + "|".join(FUEL_TYPES) + r")\b")
+_REGION = re.compile(r"\b(" + "|".join(region.lower() for region in REGIONS) + r")\b")
+
+
+def lttb(x, y, threshold: int):
+    """
+    Downsample a series with Largest-Triangle-Three-Buckets.
+
+    Args:
+        x: 1-D array of increasing x values
+        y: 1-D array of y values (same length)
+        threshold: Number of points to keep
+
+    Returns:
+        Array of indexes of the points to keep, in order
+    """
+    import numpy as np
+
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    # Interior points are split into threshold - 2 buckets
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_start, next_end = edges[bucket + 1], edges[bucket + 2] if bucket + 2 < len(edges) else n
+        average_x = x[next_start:next_end].mean()
+        average_y = y[next_start:next_end].mean()
+
+        # Keep the point forming the largest triangle with the previous kept
+        # point and the next bucket's average
+        areas = np.abs(
+            (x[previous] - average_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (average_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+
+    return selected
+
+
+def build_line_chart(
+    title: str,
+    periods: Sequence[int],
+    series: Dict[str, Any],
+    unit: str,
+    width: int = DEFAULT_CHART_WIDTH
+) -> Dict[str, Any]:
+    """
+    Build a Vega-Lite line chart with each series downsampled to ``width`` points.
+
+    Args:
+        title: Chart title
+        periods: Trading period of each column
+        series: Mapping of series name to a 1-D array of values
+        unit: Y axis unit label
+        width: Target width in pixels (one point per pixel at most)
+
+    Returns:
+        Vega-Lite spec dict
+    """
+    import numpy as np
+
+    periods = np.asarray(periods)
+    values: List[Dict[str, Any]] = []
+    for name, ys in series.items():
+        ys = np.asarray(ys, dtype=np.float64)
+        finite = ~np.isnan(ys)
+        xs, ys = periods[finite], ys[finite]
+        for index in lttb(xs, ys, width):
+            values.append({"time": period_start(int(xs[index])), "series": name, "value": round(float(ys[index]), 2)})
+
+    return {
+        "$schema": "https://vega.github.io/schema/vega-lite/v5.json",
+        "title": title,
+        "data": {"values": values},
+        "mark": {"type": "line", "interpolate": "monotone"},
+        "encoding": {
+            "x": {"field": "time", "type": "temporal", "title": None},
+            "y": {"field": "value", "type": "quantitative", "title": unit},
+            "color": {"field": "series", "type": "nominal", "title": None}
+        }
+    }
+
+
+def chart_for_question(
+    question: str,
+    history: MarketHistory,
+    width: int = DEFAULT_CHART_WIDTH
+) -> Optional[Dict[str, Any]]:
+    """
+    Build a chart for a question that asks to see data over time.
+
+    Args:
+        question: User question
+        history: Market history to chart
+        width: Target chart width in pixels
+
+    Returns:
+        Vega-Lite spec, or None if the question doesn't call for a chart or
+        there are fewer than two trading periods of history
+    """
+    text = question.lower()
+    if not _CHART_WORDS.search(text):
+        return None
+
+    window = None
+    if "week" in text:
+        window = 7 * PERIODS_PER_DAY
+    elif "today" in text or "day" in text:
+        window = PERIODS_PER_DAY
+
+    fuels = [fuel for fuel in FUEL_TYPES if fuel in set(_FUEL.findall(text))]
+    if fuels or not _PRICE_WORDS.search(text):
+        periods, names, matrix = history.generation_matrix(fuels or None)
+        title, unit = "Generation by fuel type", "MW"
+    else:
+        regions = [region for region in REGIONS if region.lower() in set(_REGION.findall(text))]
+        periods, names, matrix = history.price_matrix(regions or None)
+        title, unit = "Spot prices by region", "$/MWh"
+
+    if window is not None:
+        periods, matrix = periods[-window:], matrix[:, -window:]
+    if len(periods) < 2:
+        return None
+
+    return build_line_chart(title, periods, dict(zip(names, matrix)), unit, width)
@@ -0,0 +1,153 @@
+"""Request-scoped data context for electricity API calls.
+
+A single agent turn can call several tools that each need the same upstream
+data. ``data_context()`` opens a context for the turn; every tool running
+inside it (including tools strands runs in worker threads, which inherit
+context variables) shares one memoized fetch per endpoint, so a turn never
+hits the same endpoint twice and all tools see the same timestamps.
+"""
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, Callable, Iterator, List, Optional
+
+from tools import electricity_api
+from tools.snapshots import GenerationSnapshot, PriceSnapshot, EmissionsSnapshot
+
+logger = logging.getLogger(__name__)
+
+_current_context: ContextVar[Optional["DataContext"]] = ContextVar("electricity_data_context", default=None)
+
+# Called with each freshly fetched snapshot (e.g. by the alert engine)
+SnapshotListener = Callable[[Any], None]
+_snapshot_listeners: List[SnapshotListener] = []
+
+
+def add_snapshot_listener(listener: SnapshotListener):
+    """Register ``listener`` to receive every newly fetched snapshot."""
+    if listener not in _snapshot_listeners:
+        _snapshot_listeners.append(listener)
+
+
+def remove_snapshot_listener(listener: SnapshotListener):
+    """Stop sending snapshots to ``listener``."""
+    if listener in _snapshot_listeners:
+        _snapshot_listeners.remove(listener)
+
+
+class DataContext:
+    """Memoizes each electricity endpoint for the life of one query."""
+
+    def __init__(self):
+        self._values: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _memoize(self, key: str, fetch: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key``, fetching it at most once."""
+        if key in self._values:
+            return self._values[key]
+        with self._locks_guard:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            if key not in self._values:
+                self._values[key] = fetch()
+            return self._values[key]
+
+    def _publish(self, key: str, data: Dict[str, Any], snapshot_type) -> Dict[str, Any]:
+        """Hand a freshly fetched payload to snapshot listeners, keeping the snapshot built for them."""
+        if _snapshot_listeners:
+            snapshot = snapshot_type.from_dict(data)
+            self._values[key] = snapshot
+            for listener in list(_snapshot_listeners):
+                try:
+                    listener(snapshot)
+                except Exception as e:
+                    logger.error(f"❌ Snapshot listener failed: {str(e)}")
+        return data
+
+    def generation(self) -> Dict[str, Any]:
+        """Current generation payload (see ``get_current_generation``)."""
+        return self._memoize(
+            "generation",
+            lambda: self._publish("generation_snapshot", electricity_api.get_current_generation(), GenerationSnapshot)
+        )
+
+    def spot_prices(self) -> Dict[str, Any]:
+        """Current spot price payload (see ``get_spot_prices``)."""
+        return self._memoize(
+            "spot_prices",
+            lambda: self._publish("price_snapshot", electricity_api.get_spot_prices(), PriceSnapshot)
+        )
+
+    def carbon_emissions(self) -> Dict[str, Any]:
+        """Current emissions payload (see ``get_carbon_emissions``)."""
+        return self._memoize(
+            "carbon_emissions",
+            lambda: self._publish("emissions_snapshot", electricity_api.get_carbon_emissions(), EmissionsSnapshot)
+        )
+
+    def generation_breakdown(self) -> Dict[str, Any]:
+        """Fuel type breakdown derived from the memoized generation payload."""
+        return self._memoize(
+            "generation_breakdown",
+            lambda: electricity_api.get_generation_by_fuel_type(self.generation())
+        )
+
+    def renewable_percentage(self) -> float:
+        """Renewable percentage derived from the memoized generation payload."""
+        return self._memoize(
+            "renewable_percentage",
+            lambda: electricity_api.get_renewable_percentage(self.generation())
+        )
+
+    def generation_snapshot(self) -> GenerationSnapshot:
+        """Compact snapshot of the memoized generation payload."""
+        return self._memoize("generation_snapshot", lambda: GenerationSnapshot.from_dict(self.generation()))
+
+    def price_snapshot(self) -> PriceSnapshot:
+        """Compact snapshot of the memoized spot price payload."""
+        return self._memoize("price_snapshot", lambda: PriceSnapshot.from_dict(self.spot_prices()))
+
+    def emissions_snapshot(self) -> EmissionsSnapshot:
+        """Compact snapshot of the memoized emissions payload."""
+        return self._memoize("emissions_snapshot", lambda: EmissionsSnapshot.from_dict(self.carbon_emissions()))
+
+
+def current_data_context() -> Optional[DataContext]:
+    """Return the data context for the running query, if any."""
+    return _current_context.get()
+
+
+def get_data_context() -> DataContext:
+    """
+    Return the running query's data context.
+
+    Outside a query a fresh, throwaway context is returned so callers always
+    get current data.
+    """
+    return _current_context.get() or DataContext()
+
+
+@contextmanager
+def data_context() -> Iterator[DataContext]:
+    """
+    Open a data context for one query.
+
+    Nested calls reuse the outer context so the whole turn shares one snapshot.
+
+    Yields:
+        The active DataContext
+    """
+    context = _current_context.get()
+    if context is not None:
+        yield context
+        return
+
+    context = DataContext()
+    token = _current_context.set(context)
+    try:
+        yield context
+    finally:
+        _current_context.reset(token)
@@ -1,23 +1,12 @@
 """Electricity API tool functions for fetching NZ electricity data."""
-import httpx
-from typing import Dict, Any
-import os
+from typing import Dict, Any, Optional
 import logging
-from dotenv import load_dotenv
+from config import get_settings
+from tools.snapshots import GenerationSnapshot
 
-load_dotenv()
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# httpx is imported inside each fetcher so importing this module stays cheap
 logger = logging.getLogger(__name__)
 
-# API endpoints (using public em6 data)
-EM6_BASE_URL = "https://api.em6.co.nz/v1"
-EMI_BASE_URL = "https://emi.portal.azure-api.net"
-
 
 def get_current_generation() -> Dict[str, Any]:
     """
@@ -26,14 +15,17 @@ def get_current_generation() -> Dict[str, Any]:
     Returns:
         Dict containing total generation and breakdown by type
     """
+    import httpx
+    settings = get_settings()
+    
     try:
         # Using em6 public API endpoint
-        url = f"{EM6_BASE_URL}/generation/current"
+        url = f"{settings.em6_base_url}/generation/current"
         
         logger.info(f"🔌 Making API request to: {url}")
         
         # Make request
-        response = httpx.get(url, timeout=10.0)
+        response = httpx.get(url, timeout=settings.http_timeout)
         
         logger.info(f"📊 API Response - Status: {response.status_code}")
         
@@ -69,12 +61,15 @@ def get_spot_prices() -> Dict[str, Any]:
     Returns:
         Dict containing spot prices for different regions
     """
+    import httpx
+    settings = get_settings()
+    
     try:
-        url = f"{EM6_BASE_URL}/prices/spot/current"
+        url = f"{settings.em6_base_url}/prices/spot/current"
         
         logger.info(f"💰 Making price API request to: {url}")
         
-        response = httpx.get(url, timeout=10.0)
+        response = httpx.get(url, timeout=settings.http_timeout)
         
         logger.info(f"📊 Price API Response - Status: {response.status_code}")
         
@@ -135,10 +130,13 @@ def get_carbon_emissions() -> Dict[str, Any]:
     Returns:
         Dict containing carbon intensity information
     """
+    import httpx
+    settings = get_settings()
+    
     try:
-        url = f"{EM6_BASE_URL}/emissions/current"
+        url = f"{settings.em6_base_url}/emissions/current"
         
-        response = httpx.get(url, timeout=10.0)
+        response = httpx.get(url, timeout=settings.http_timeout)
         
         if response.status_code == 200:
             return response.json()
@@ -153,32 +151,20 @@ def get_carbon_emissions() -> Dict[str, Any]:
         raise Exception(f"API request failed: {str(e)}")
 
 
-def get_generation_by_fuel_type() -> Dict[str, Any]:
+def get_generation_by_fuel_type(generation_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Get detailed generation breakdown by fuel type.
     
+    Args:
+        generation_data: Already-fetched generation data; fetched when omitted
+        
     Returns:
         Dict with detailed fuel type breakdown
     """
-    generation_data = get_current_generation()
+    if generation_data is None:
+        generation_data = get_current_generation()
     
     if "generation_by_type" in generation_data:
-        total = generation_data["total_generation_mw"]
-        breakdown = generation_data["generation_by_type"]
-        
-        # Calculate percentages
-        result = {
-            "timestamp": generation_data.get("timestamp"),
-            "total_generation_mw": total,
-            "breakdown": {}
-        }
-        
-        for fuel_type, mw in breakdown.items():
-            result["breakdown"][fuel_type] = {
-                "mw": mw,
-                "percentage": round((mw / total) * 100, 1) if total > 0 else 0
-            }
-        
-        return result
+        return GenerationSnapshot.from_dict(generation_data).to_breakdown_dict()
     
-    return generation_data
\ No newline at end of file
+    return generation_data
@@ -0,0 +1,222 @@
+"""Lightweight price and demand forecasts from the local market history.
+
+Forecasts are CPU-only NumPy computations over every series at once: a
+seasonal-naive forecast (same trading period yesterday) once a day of
+history exists, otherwise damped Holt exponential smoothing. The table is
+recomputed in a background thread when a new trading period arrives and
+served from cache. A forecast question only computes the table itself (in
+milliseconds) when the cache has no section yet for a series with history.
+"""
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+from tools.data_context import add_snapshot_listener
+from tools.history import MarketHistory, PERIODS_PER_DAY, get_market_history, period_start
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HORIZON = 16  # eight hours of trading periods
+
+_shared_forecaster: Optional["Forecaster"] = None
+_shared_forecaster_lock = threading.Lock()
+
+
+def holt_forecast(matrix, horizon: int, alpha: float = 0.5, beta: float = 0.3, phi: float = 0.9):
+    """
+    Damped Holt linear exponential smoothing, vectorized across series.
+
+    Args:
+        matrix: float64 array [series, period] without gaps
+        horizon: Number of periods to forecast
+        alpha: Level smoothing factor
+        beta: Trend smoothing factor
+        phi: Trend damping factor
+
+    Returns:
+        float64 array [series, horizon]
+    """
+    import numpy as np
+
+    level = matrix[:, 0].copy()
+    trend = np.zeros_like(level)
+    if matrix.shape[1] > 1:
+        trend = matrix[:, 1] - matrix[:, 0]
+    for column in range(1, matrix.shape[1]):
+        previous_level = level
+        level = alpha * matrix[:, column] + (1 - alpha) * (previous_level + phi * trend)
+        trend = beta * (level - previous_level) + (1 - beta) * phi * trend
+
+    damping = np.cumsum(phi ** np.arange(1, horizon + 1))
+    return level[:, None] + damping[None, :] * trend[:, None]
+
+
+def seasonal_naive_forecast(matrix, horizon: int, season: int = PERIODS_PER_DAY):
+    """
+    Repeat the value from the same trading period one season (day) earlier.
+
+    Args:
+        matrix: float64 array [series, period] with at least ``season`` periods
+        horizon: Number of periods to forecast
+        season: Season length in periods
+
+    Returns:
+        float64 array [series, horizon]
+    """
+    import numpy as np
+
+    last_season = matrix[:, -season:]
+    return last_season[:, np.arange(horizon) % season]
+
+
+def forecast_matrix(matrix, horizon: int):
+    """Forecast every row of ``matrix`` with the best method its history allows."""
+    if matrix.shape[1] >= PERIODS_PER_DAY:
+        return "seasonal_naive", seasonal_naive_forecast(matrix, horizon)
+    return "holt", holt_forecast(matrix, horizon)
+
+
+def _rounded(value) -> Optional[float]:
+    """Round for display; series with no observations yield None rather than NaN."""
+    value = float(value)
+    return None if value != value else round(value, 2)
+
+
+def build_forecast_table(history: MarketHistory, horizon: int = DEFAULT_HORIZON) -> Dict[str, Any]:
+    """
+    Forecast spot prices by region, generation by fuel type and demand.
+
+    Args:
+        history: Market history to forecast from
+        horizon: Number of trading periods ahead
+
+    Returns:
+        JSON-ready dict of forecast periods and values per series
+    """
+    table: Dict[str, Any] = {"horizon_periods": horizon, "prices": {}, "generation": {}, "demand": None}
+
+    sections = [
+        ("prices", history.price_matrix()),
+        ("generation", history.generation_matrix()),
+    ]
+    demand_periods, demand = history.demand_series()
+    sections.append(("demand", (demand_periods, ["total_generation_mw"], demand.reshape(1, -1))))
+
+    for section, (periods, names, matrix) in sections:
+        if matrix.shape[1] == 0:
+            continue
+        method, values = forecast_matrix(matrix, horizon)
+        first = int(periods[-1]) + 1
+        forecast_periods = [period_start(first + step) for step in range(horizon)]
+        series = {
+            name: {
+                "method": method,
+                "history_periods": int(matrix.shape[1]),
+                "last_value": _rounded(matrix[row, -1]),
+                "periods": forecast_periods,
+                "values": [_rounded(value) for value in values[row]]
+            }
+            for row, name in enumerate(names)
+        }
+        if section == "demand":
+            table["demand"] = series["total_generation_mw"]
+        else:
+            table[section] = series
+
+    latest = history.latest_period()
+    table["generated_for_period"] = period_start(latest) if latest is not None else None
+    return table
+
+
+class Forecaster:
+    """Caches the forecast table, recomputing it once per trading period in the background."""
+
+    def __init__(self, history: MarketHistory, horizon: int = DEFAULT_HORIZON):
+        self.history = history
+        self.horizon = horizon
+        self._table: Optional[Dict[str, Any]] = None
+        self._table_key = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def _is_current(self) -> bool:
+        return self._table_key == self.history.latest_periods()
+
+    def _compute(self):
+        """Rebuild the table until it reflects the latest trading period of every series."""
+        while True:
+            key = self.history.latest_periods()
+            try:
+                table = build_forecast_table(self.history, self.horizon)
+            except Exception as e:
+                logger.error(f"❌ Forecast refresh failed: {str(e)}")
+                with self._lock:
+                    self._refreshing = False
+                return
+            with self._lock:
+                self._table, self._table_key = table, key
+                if self._is_current():
+                    self._refreshing = False
+                    break
+        logger.info(f"📈 Forecast refreshed for trading periods {key}")
+
+    def _start_refresh(self) -> bool:
+        with self._lock:
+            if self._refreshing or self._is_current() or self.history.latest_period() is None:
+                return False
+            self._refreshing = True
+            return True
+
+    def refresh_in_background(self) -> bool:
+        """
+        Start recomputing the table if the history has a newer trading period.
+
+        Returns:
+            True if a refresh was started
+        """
+        if not self._start_refresh():
+            return False
+        threading.Thread(target=self._compute, name="forecast-refresh", daemon=True).start()
+        return True
+
+    def observe(self, snapshot: Any):
+        """Snapshot listener: schedule a refresh when a new trading period arrives."""
+        self.refresh_in_background()
+
+    def _has_gap(self, key) -> bool:
+        """True if a series has history but the cached table has no section for it."""
+        cached = self._table_key or (None, None)
+        return any(latest is not None and seen is None for latest, seen in zip(key, cached))
+
+    def table(self) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached forecast table.
+
+        The cached table is served as is, even while a background refresh for
+        a newer trading period runs. Only when it is missing a section that
+        the history has data for (no table yet, or prices arrived just after
+        generation) is the table built synchronously, which takes milliseconds.
+        """
+        key = self.history.latest_periods()
+        with self._lock:
+            table = self._table
+            if not self._has_gap(key):
+                return table
+
+        table = build_forecast_table(self.history, self.horizon)
+        with self._lock:
+            if self._has_gap(key):
+                self._table, self._table_key = table, key
+        return table
+
+
+def get_forecaster() -> Forecaster:
+    """Return the process-wide forecaster, refreshed as new trading periods arrive."""
+    global _shared_forecaster
+    with _shared_forecaster_lock:
+        if _shared_forecaster is None:
+            # The history listener is registered first, so it has filed the
+            # snapshot by the time the forecaster hears about it
+            _shared_forecaster = Forecaster(get_market_history())
+            add_snapshot_listener(_shared_forecaster.observe)
+        return _shared_forecaster
@@ -0,0 +1,201 @@
+"""Local history of market snapshots, one entry per trading period.
+
+The NZ market settles in 48 half-hour trading periods a day. Every fetched
+price and generation snapshot is filed under its trading period (a later
+snapshot in the same period replaces the earlier one) in a bounded ring
+buffer, giving forecasting and charts a regular time series without another
+data source.
+"""
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, List, Optional, Sequence, Tuple
+
+from tools.data_context import add_snapshot_listener
+from tools.snapshots import GenerationSnapshot, PriceSnapshot
+
+TRADING_PERIOD_SECONDS = 30 * 60
+PERIODS_PER_DAY = 48
+DEFAULT_CAPACITY = 7 * PERIODS_PER_DAY
+
+_shared_history: Optional["MarketHistory"] = None
+_shared_history_lock = threading.Lock()
+
+
+def trading_period(timestamp: Optional[str]) -> Optional[int]:
+    """
+    Return the index of the half-hour trading period containing ``timestamp``.
+
+    Args:
+        timestamp: ISO 8601 timestamp, e.g. "2025-07-30T12:00:00Z"
+
+    Returns:
+        Trading periods since the Unix epoch, or None if the timestamp can't be parsed
+    """
+    if not timestamp:
+        return None
+    try:
+        moment = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp()) // TRADING_PERIOD_SECONDS
+
+
+def current_trading_period(now: Optional[float] = None) -> int:
+    """Return the index of the trading period containing ``now`` (default: the current time)."""
+    return int(time.time() if now is None else now) // TRADING_PERIOD_SECONDS
+
+
+def period_start(period: int) -> str:
+    """Return the UTC start time of a trading period as an ISO 8601 string."""
+    moment = datetime.fromtimestamp(period * TRADING_PERIOD_SECONDS, tz=timezone.utc)
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class _SnapshotSeries:
+    """Ring buffer of (trading period, snapshot), one snapshot per period."""
+
+    def __init__(self, capacity: int):
+        self.entries: Deque[Tuple[int, Any]] = deque(maxlen=capacity)
+
+    def add(self, period: int, snapshot: Any) -> bool:
+        """Store ``snapshot``; returns True if it opened a new trading period."""
+        if self.entries and self.entries[-1][0] == period:
+            self.entries[-1] = (period, snapshot)
+            return False
+        if self.entries and period < self.entries[-1][0]:
+            return False  # out-of-order data is ignored
+        self.entries.append((period, snapshot))
+        return True
+
+
+class MarketHistory:
+    """Bounded per-trading-period history of prices and generation."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self._prices = _SnapshotSeries(capacity)
+        self._generation = _SnapshotSeries(capacity)
+        self._lock = threading.Lock()
+
+    def observe(self, snapshot: Any) -> bool:
+        """
+        File a price or generation snapshot under its trading period.
+
+        Returns:
+            True if the snapshot started a new trading period
+        """
+        if isinstance(snapshot, PriceSnapshot):
+            series = self._prices
+        elif isinstance(snapshot, GenerationSnapshot):
+            series = self._generation
+        else:
+            return False
+
+        period = trading_period(snapshot.timestamp)
+        if period is None:
+            return False
+        with self._lock:
+            return series.add(period, snapshot)
+
+    def latest_periods(self) -> Tuple[Optional[int], Optional[int]]:
+        """Return the latest trading period of the price and generation series."""
+        with self._lock:
+            return tuple(
+                series.entries[-1][0] if series.entries else None
+                for series in (self._prices, self._generation)
+            )
+
+    def latest_period(self) -> Optional[int]:
+        """Return the most recent trading period with any data."""
+        with self._lock:
+            periods = [series.entries[-1][0] for series in (self._prices, self._generation) if series.entries]
+        return max(periods) if periods else None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return max(len(self._prices.entries), len(self._generation.entries))
+
+    def price_matrix(self, regions: Optional[Sequence[str]] = None):
+        """
+        Return spot prices as a dense matrix over consecutive trading periods.
+
+        Gaps are forward-filled so the series are regularly spaced.
+
+        Args:
+            regions: Regions to include (defaults to those in the latest snapshot)
+
+        Returns:
+            Tuple of (periods array, region names, float64 matrix [region, period])
+        """
+        with self._lock:
+            entries = list(self._prices.entries)
+        if regions is None:
+            regions = entries[-1][1].regions if entries else ()
+        return self._matrix(entries, list(regions), lambda snapshot, name: snapshot.get(name))
+
+    def generation_matrix(self, fuel_types: Optional[Sequence[str]] = None):
+        """
+        Return generation by fuel type as a dense matrix over consecutive trading periods.
+
+        Args:
+            fuel_types: Fuel types to include (defaults to those in the latest snapshot)
+
+        Returns:
+            Tuple of (periods array, fuel type names, float64 matrix [fuel type, period])
+        """
+        with self._lock:
+            entries = list(self._generation.entries)
+        if fuel_types is None:
+            fuel_types = entries[-1][1].fuel_types if entries else ()
+        return self._matrix(entries, list(fuel_types), lambda snapshot, name: snapshot.get(name, None))
+
+    def demand_series(self):
+        """
+        Return total generation (a proxy for demand) over consecutive trading periods.
+
+        Returns:
+            Tuple of (periods array, float64 array)
+        """
+        with self._lock:
+            entries = list(self._generation.entries)
+        periods, _, matrix = self._matrix(
+            entries, ["total"], lambda snapshot, name: snapshot.total_generation_mw
+        )
+        return periods, matrix[0] if len(matrix) else matrix
+
+    @staticmethod
+    def _matrix(entries: List[Tuple[int, Any]], names: List[str], value_of):
+        import numpy as np
+
+        if not entries or not names:
+            return np.empty(0, dtype=np.int64), names, np.empty((len(names), 0))
+
+        first, last = entries[0][0], entries[-1][0]
+        periods = np.arange(first, last + 1, dtype=np.int64)
+        matrix = np.full((len(names), len(periods)), np.nan)
+        for period, snapshot in entries:
+            column = period - first
+            for row, name in enumerate(names):
+                value = value_of(snapshot, name)
+                if value is not None:
+                    matrix[row, column] = value
+
+        # Forward-fill gaps along the time axis
+        filled = np.where(~np.isnan(matrix), np.arange(len(periods)), 0)
+        np.maximum.accumulate(filled, axis=1, out=filled)
+        matrix = matrix[np.arange(len(names))[:, None], filled]
+        return periods, names, matrix
+
+
+def get_market_history() -> MarketHistory:
+    """Return the process-wide market history, subscribing it to new snapshots on first use."""
+    global _shared_history
+    with _shared_history_lock:
+        if _shared_history is None:
+            _shared_history = MarketHistory()
+            add_snapshot_listener(_shared_history.observe)
+        return _shared_history
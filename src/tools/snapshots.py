@@ -0,0 +1,251 @@
+"""Compact snapshot types for NZ electricity data.
+
+The em6 fetchers return plain nested dicts. These classes hold the same data
+in ``__slots__`` instances backed by ``array('d')`` so long histories and many
+concurrent sessions don't pay for a dict per fuel type or region. Key tuples
+(fuel types, regions) are interned and shared between snapshots.
+"""
+from array import array
+from typing import Dict, Any, Optional, Tuple
+
+# Canonical orderings, shared by every snapshot that uses them
+FUEL_TYPES: Tuple[str, ...] = ("hydro", "wind", "geothermal", "gas", "solar")
+RENEWABLE_FUEL_TYPES = frozenset(("hydro", "wind", "geothermal", "solar"))
+REGIONS: Tuple[str, ...] = ("Auckland", "Wellington", "Christchurch", "Dunedin")
+
+_KEY_CACHE: Dict[Tuple[str, ...], Tuple[str, ...]] = {
+    FUEL_TYPES: FUEL_TYPES,
+    REGIONS: REGIONS,
+}
+
+
+def _intern_keys(keys) -> Tuple[str, ...]:
+    """Return a shared tuple for ``keys`` so identical layouts aren't duplicated."""
+    keys = tuple(keys)
+    return _KEY_CACHE.setdefault(keys, keys)
+
+
+def _json_number(value: float):
+    """Render whole floats as ints to match the upstream API payloads."""
+    return int(value) if value.is_integer() else value
+
+
+class GenerationSnapshot:
+    """Generation in MW by fuel type at a point in time."""
+
+    __slots__ = ("timestamp", "total_generation_mw", "fuel_types", "mw")
+
+    def __init__(
+        self,
+        timestamp: Optional[str],
+        total_generation_mw: float,
+        fuel_types: Tuple[str, ...],
+        mw: array
+    ):
+        self.timestamp = timestamp
+        self.total_generation_mw = total_generation_mw
+        self.fuel_types = fuel_types
+        self.mw = mw
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "GenerationSnapshot":
+        """
+        Build a snapshot from a ``get_current_generation`` payload.
+
+        Args:
+            data: Dict containing timestamp, total_generation_mw and generation_by_type
+
+        Returns:
+            GenerationSnapshot holding the same values
+        """
+        by_type = data.get("generation_by_type", {})
+        total = data.get("total_generation_mw")
+        if total is None:
+            total = sum(by_type.values())
+        return cls(
+            data.get("timestamp"),
+            total,
+            _intern_keys(by_type.keys()),
+            array("d", by_type.values())
+        )
+
+    def get(self, fuel_type: str, default: float = 0.0) -> float:
+        """Return generation in MW for ``fuel_type``."""
+        try:
+            return self.mw[self.fuel_types.index(fuel_type)]
+        except ValueError:
+            return default
+
+    def percentage(self, fuel_type: str) -> float:
+        """Return the share of total generation for ``fuel_type``."""
+        total = self.total_generation_mw
+        return round((self.get(fuel_type) / total) * 100, 1) if total > 0 else 0
+
+    def renewable_percentage(self) -> float:
+        """Return the renewable share of generation, as in ``get_renewable_percentage``."""
+        total = sum(self.mw)
+        if total == 0:
+            return 0.0
+        renewable = sum(
+            mw for fuel_type, mw in zip(self.fuel_types, self.mw)
+            if fuel_type in RENEWABLE_FUEL_TYPES
+        )
+        return round((renewable / total) * 100, 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the JSON-ready payload in the ``get_current_generation`` shape."""
+        return {
+            "timestamp": self.timestamp,
+            "total_generation_mw": self.total_generation_mw,
+            "generation_by_type": {
+                fuel_type: _json_number(mw)
+                for fuel_type, mw in zip(self.fuel_types, self.mw)
+            }
+        }
+
+    def to_breakdown_dict(self) -> Dict[str, Any]:
+        """Return the JSON-ready payload in the ``get_generation_by_fuel_type`` shape."""
+        return {
+            "timestamp": self.timestamp,
+            "total_generation_mw": self.total_generation_mw,
+            "breakdown": {
+                fuel_type: {
+                    "mw": _json_number(mw),
+                    "percentage": self.percentage(fuel_type)
+                }
+                for fuel_type, mw in zip(self.fuel_types, self.mw)
+            }
+        }
+
+    def to_numpy(self):
+        """Return generation by fuel type as a float64 NumPy array (``fuel_types`` order)."""
+        import numpy as np
+        return np.frombuffer(self.mw, dtype=np.float64).copy()
+
+    def __eq__(self, other):
+        if not isinstance(other, GenerationSnapshot):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"GenerationSnapshot(timestamp={self.timestamp!r}, total_generation_mw={self.total_generation_mw!r})"
+
+
+class PriceSnapshot:
+    """Spot prices in $/MWh by region at a point in time."""
+
+    __slots__ = ("timestamp", "regions", "prices")
+
+    def __init__(self, timestamp: Optional[str], regions: Tuple[str, ...], prices: array):
+        self.timestamp = timestamp
+        self.regions = regions
+        self.prices = prices
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PriceSnapshot":
+        """
+        Build a snapshot from a ``get_spot_prices`` payload.
+
+        Args:
+            data: Dict containing timestamp and prices by region
+
+        Returns:
+            PriceSnapshot holding the same values
+        """
+        prices = data.get("prices", {})
+        return cls(
+            data.get("timestamp"),
+            _intern_keys(prices.keys()),
+            array("d", prices.values())
+        )
+
+    def get(self, region: str, default: Optional[float] = None) -> Optional[float]:
+        """Return the spot price for ``region``."""
+        try:
+            return self.prices[self.regions.index(region)]
+        except ValueError:
+            return default
+
+    def average(self) -> float:
+        """Return the mean spot price across regions."""
+        return sum(self.prices) / len(self.prices) if self.prices else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the JSON-ready payload in the ``get_spot_prices`` shape."""
+        return {
+            "timestamp": self.timestamp,
+            "prices": {
+                region: _json_number(price)
+                for region, price in zip(self.regions, self.prices)
+            }
+        }
+
+    def to_numpy(self):
+        """Return prices as a float64 NumPy array (``regions`` order)."""
+        import numpy as np
+        return np.frombuffer(self.prices, dtype=np.float64).copy()
+
+    def __eq__(self, other):
+        if not isinstance(other, PriceSnapshot):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"PriceSnapshot(timestamp={self.timestamp!r}, regions={len(self.regions)})"
+
+
+class EmissionsSnapshot:
+    """Carbon intensity and total emissions at a point in time."""
+
+    __slots__ = ("timestamp", "carbon_intensity_gco2_kwh", "total_emissions_tonnes_per_hour")
+
+    def __init__(
+        self,
+        timestamp: Optional[str],
+        carbon_intensity_gco2_kwh: float,
+        total_emissions_tonnes_per_hour: float
+    ):
+        self.timestamp = timestamp
+        self.carbon_intensity_gco2_kwh = carbon_intensity_gco2_kwh
+        self.total_emissions_tonnes_per_hour = total_emissions_tonnes_per_hour
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EmissionsSnapshot":
+        """
+        Build a snapshot from a ``get_carbon_emissions`` payload.
+
+        Args:
+            data: Dict containing timestamp, carbon intensity and total emissions
+
+        Returns:
+            EmissionsSnapshot holding the same values
+        """
+        return cls(
+            data.get("timestamp"),
+            data.get("carbon_intensity_gco2_kwh", 0),
+            data.get("total_emissions_tonnes_per_hour", 0)
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the JSON-ready payload in the ``get_carbon_emissions`` shape."""
+        return {
+            "timestamp": self.timestamp,
+            "carbon_intensity_gco2_kwh": self.carbon_intensity_gco2_kwh,
+            "total_emissions_tonnes_per_hour": self.total_emissions_tonnes_per_hour
+        }
+
+    def to_numpy(self):
+        """Return ``[carbon_intensity_gco2_kwh, total_emissions_tonnes_per_hour]`` as float64."""
+        import numpy as np
+        return np.array(
+            [self.carbon_intensity_gco2_kwh, self.total_emissions_tonnes_per_hour],
+            dtype=np.float64
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, EmissionsSnapshot):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"EmissionsSnapshot(timestamp={self.timestamp!r}, carbon_intensity_gco2_kwh={self.carbon_intensity_gco2_kwh!r})"
@@ -1,8 +1,12 @@
 """Streamlit chat interface for the electricity chatbot."""
 import streamlit as st
 import asyncio
-from typing import Dict, Any, List
-from agents.mock_electricity_agent import create_mock_electricity_agent as create_electricity_agent
+from typing import Dict, Any, List, Optional, Union
+from config import configure_logging
+from tools.alerts import get_alert_engine
+
+# Messages rendered per rerun; "Load earlier" reveals another page
+HISTORY_PAGE_SIZE = 20
 
 
 def initialize_chat():
@@ -12,17 +16,43 @@ def initialize_chat():
     
     if 'agent' not in st.session_state:
         st.session_state.agent = None
+    
+    if 'history_window' not in st.session_state:
+        st.session_state.history_window = HISTORY_PAGE_SIZE
+    
+    if 'alert_subscription' not in st.session_state:
+        st.session_state.alert_subscription = get_alert_engine().subscribe()
 
 
-def display_message(message: Dict[str, str]):
-    """Display a chat message."""
+def render_markdown(content: str) -> str:
+    """
+    Prepare message content for ``st.markdown``.
+    
+    Dollar signs are escaped so prices like "$150.50 ... $148.20" aren't
+    rendered as LaTeX.
+    """
+    return content.replace("\\$", "$").replace("$", "\\$")
+
+
+def display_message(message: Dict[str, Any]):
+    """Display a chat message, with its chart if it has one."""
     with st.chat_message(message["role"]):
-        st.write(message["content"])
+        if "markdown" in message:
+            st.markdown(message["markdown"])
+        else:
+            st.write(message["content"])
+        # The spec was built (and downsampled) once when the answer arrived
+        if message.get("chart"):
+            st.vega_lite_chart(message["chart"], use_container_width=True)
 
 
-def add_to_history(role: str, content: str):
-    """Add message to chat history."""
-    st.session_state.messages.append({"role": role, "content": content})
+def add_to_history(role: str, content: str, chart: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Add message to chat history, rendering its markdown once."""
+    message = {"role": role, "content": content, "markdown": render_markdown(content)}
+    if chart:
+        message["chart"] = chart
+    st.session_state.messages.append(message)
+    return message
 
 
 def display_error(error_message: str):
@@ -30,12 +60,24 @@ def display_error(error_message: str):
     st.error(f"Error: {error_message}")
 
 
-async def get_agent_response(question: str) -> str:
-    """Get response from the electricity agent."""
+def display_new_alerts():
+    """Show market alerts pushed to this session since the last rerun."""
+    subscription = st.session_state.get('alert_subscription')
+    if subscription is None:
+        return
+    
+    for alert in subscription.drain():
+        st.toast(f"⚠️ {alert.message}")
+
+
+async def get_agent_response(question: str) -> Dict[str, Any]:
+    """Get response (content and optional chart) from the electricity agent."""
     if st.session_state.agent is None:
+        # Imported on first question so the first script run doesn't pay for it
+        from agents.mock_electricity_agent import create_mock_electricity_agent as create_electricity_agent
         st.session_state.agent = await create_electricity_agent()
     
-    return await st.session_state.agent.query(question)
+    return await st.session_state.agent.respond(question)
 
 
 def process_with_loading(async_func, loading_text: str = "Processing..."):
@@ -51,21 +93,36 @@ def process_with_loading(async_func, loading_text: str = "Processing..."):
             loop.close()
 
 
-def process_user_input(user_input: str) -> str:
-    """Process user input and get agent response."""
+def process_user_input(user_input: str) -> Dict[str, Any]:
+    """Process user input and return the assistant message added to history."""
     # Add user message to history
     add_to_history("user", user_input)
     
     # Get agent response
-    response = process_with_loading(
+    response: Union[str, Dict[str, Any]] = process_with_loading(
         lambda: get_agent_response(user_input),
         "Getting electricity data..."
     )
+    if isinstance(response, str):
+        response = {"content": response}
     
     # Add assistant response to history
-    add_to_history("assistant", response)
+    return add_to_history("assistant", response["content"], response.get("chart"))
+
+
+def display_history():
+    """Display the most recent messages, with a control to load earlier ones."""
+    messages = st.session_state.messages
+    window = st.session_state.history_window
+    hidden = max(len(messages) - window, 0)
     
-    return response
+    if hidden and st.button(f"⬆️ Load earlier messages ({hidden} hidden)", key="load_earlier"):
+        st.session_state.history_window = window + HISTORY_PAGE_SIZE
+        st.rerun()
+    
+    # Only the visible window is rendered, so a rerun costs the same however long the chat is
+    for message in messages[hidden:]:
+        display_message(message)
 
 
 def render_chat_interface():
@@ -77,25 +134,27 @@ def render_chat_interface():
     initialize_chat()
     
     # Display chat history
-    for message in st.session_state.messages:
-        display_message(message)
+    display_history()
     
     # Chat input
     if prompt := st.chat_input("Ask about NZ electricity data..."):
         # Display user message immediately
-        display_message({"role": "user", "content": prompt})
+        display_message({"role": "user", "content": prompt, "markdown": render_markdown(prompt)})
         
         try:
             # Process and get response
             response = process_user_input(prompt)
             
             # Display assistant response
-            display_message({"role": "assistant", "content": response})
+            display_message(response)
             
         except Exception as e:
             error_msg = "Sorry, I encountered an error processing your request. Please try again."
             display_error(error_msg)
             add_to_history("assistant", error_msg)
+    
+    # Alerts raised by data fetched during this rerun (or by other sessions)
+    display_new_alerts()
 
 
 def render_sidebar():
@@ -114,17 +173,23 @@ def render_sidebar():
         
         for question in example_questions:
             if st.button(question, key=f"example_{hash(question)}"):
-                # Add to chat when clicked
-                st.session_state.messages.append({"role": "user", "content": question})
+                # Add to chat when clicked (process_user_input records the question)
                 try:
-                    response = process_user_input(question)
+                    process_user_input(question)
                 except Exception as e:
                     error_msg = "Error processing example question. Please try again."
-                    st.session_state.messages.append({"role": "assistant", "content": error_msg})
+                    add_to_history("assistant", error_msg)
                 st.rerun()
         
         st.divider()
         
+        active_alerts = get_alert_engine().active_alerts()
+        if active_alerts:
+            st.header("⚠️ Market Alerts")
+            for alert in active_alerts:
+                st.warning(alert.message)
+            st.divider()
+        
         st.markdown("""
         ### About
         This chatbot uses:
@@ -141,6 +206,8 @@ def render_sidebar():
 
 def main():
     """Main Streamlit app."""
+    configure_logging()
+    
     st.set_page_config(
         page_title="NZ Electricity Chatbot",
         page_icon="⚡",
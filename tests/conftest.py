@@ -0,0 +1,117 @@
+import copy
+import pytest
+
+# Shared electricity API payloads, httpx stub and snapshot builders
+
+
+GENERATION = {
+    "timestamp": "2025-07-30T12:00:00Z",
+    "total_generation_mw": 5000,
+    "generation_by_type": {
+        "hydro": 3000,
+        "wind": 800,
+        "geothermal": 700,
+        "gas": 400,
+        "solar": 100
+    }
+}
+
+PRICES = {
+    "timestamp": "2025-07-30T12:00:00Z",
+    "prices": {
+        "Auckland": 150.50,
+        "Wellington": 148.20,
+        "Christchurch": 145.80,
+        "Dunedin": 143.90
+    }
+}
+
+EMISSIONS = {
+    "timestamp": "2025-07-30T12:00:00Z",
+    "carbon_intensity_gco2_kwh": 82,
+    "total_emissions_tonnes_per_hour": 410
+}
+
+
+@pytest.fixture(autouse=True)
+def fresh_market_state(monkeypatch):
+    """Give each test its own alert engine, market history, forecaster and snapshot listeners."""
+    from tools import alerts, data_context, forecast, history
+
+    monkeypatch.setattr(data_context, "_snapshot_listeners", [])
+    monkeypatch.setattr(alerts, "_shared_engine", None)
+    monkeypatch.setattr(history, "_shared_history", None)
+    monkeypatch.setattr(forecast, "_shared_forecaster", None)
+
+
+@pytest.fixture
+def generation_payload():
+    """A ``get_current_generation`` payload (a fresh copy per test)."""
+    return copy.deepcopy(GENERATION)
+
+
+@pytest.fixture
+def price_payload():
+    """A ``get_spot_prices`` payload (a fresh copy per test)."""
+    return copy.deepcopy(PRICES)
+
+
+@pytest.fixture
+def emissions_payload():
+    """A ``get_carbon_emissions`` payload (a fresh copy per test)."""
+    return copy.deepcopy(EMISSIONS)
+
+
+@pytest.fixture
+def em6_get(generation_payload, price_payload, emissions_payload):
+    """``httpx.get`` stand-in that answers each em6 URL with its payload fixture."""
+    def respond(url, timeout):
+        response = type("Response", (), {})()
+        response.status_code = 200
+        if "prices" in url:
+            payload = price_payload
+        elif "emissions" in url:
+            payload = emissions_payload
+        else:
+            payload = generation_payload
+        response.json = lambda: payload
+        return response
+
+    return respond
+
+
+def _timestamp(when):
+    """Accept an ISO timestamp (or any label) or a trading period index."""
+    if isinstance(when, int):
+        from tools.history import period_start
+        return period_start(when)
+    return when
+
+
+@pytest.fixture
+def price_snapshot():
+    """Build a PriceSnapshot for Auckland and Wellington at a timestamp or trading period."""
+    from tools.snapshots import PriceSnapshot
+
+    def build(when, auckland: float, wellington: float = 148.0):
+        return PriceSnapshot.from_dict({
+            "timestamp": _timestamp(when),
+            "prices": {"Auckland": auckland, "Wellington": wellington}
+        })
+
+    return build
+
+
+@pytest.fixture
+def generation_snapshot():
+    """Build a GenerationSnapshot from MW by fuel type at a timestamp or trading period."""
+    from tools.snapshots import GenerationSnapshot
+
+    def build(when, **generation_by_type: float):
+        return GenerationSnapshot.from_dict({
+            "timestamp": _timestamp(when),
+            "total_generation_mw": sum(generation_by_type.values()),
+            "generation_by_type": generation_by_type
+        })
+
+    return build
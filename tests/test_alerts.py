@@ -0,0 +1,161 @@
+import pytest
+import time
+from unittest.mock import patch
+
+# Tests for the incremental alert engine
+
+
+class TestAlertEngine:
+    """Test spike and low-renewables detection."""
+
+    def test_ewma_stats(self):
+        """Test running mean and variance follow the EWMA recurrences."""
+        from tools.alerts import EwmaStats
+
+        stats = EwmaStats(alpha=0.5)
+        for value in (100.0, 110.0, 90.0):
+            stats.update(value)
+
+        # mean: 100 -> 105 -> 97.5; variance: 0 -> 25 -> 68.75
+        assert stats.mean == pytest.approx(97.5)
+        assert stats.variance == pytest.approx(68.75)
+        assert stats.count == 3
+
+    def test_price_spike_detected_once(self, price_snapshot):
+        """Test a spike raises one alert and clears when prices settle."""
+        from tools.alerts import AlertEngine, PRICE_SPIKE
+
+        engine = AlertEngine(min_observations=4)
+        for minute in range(8):
+            assert engine.observe(price_snapshot(f"t{minute}", 150.0 + minute % 2)) == []
+
+        alerts = engine.observe(price_snapshot("spike", 420.0))
+
+        assert [alert.kind for alert in alerts] == [PRICE_SPIKE]
+        assert alerts[0].region == "Auckland"
+        assert engine.observe(price_snapshot("still-high", 430.0)) == []
+        assert len(engine.active_alerts()) == 1
+
+        for minute in range(20):
+            engine.observe(price_snapshot(f"settled{minute}", 150.0))
+        assert engine.active_alerts() == []
+
+    def test_same_snapshot_evaluated_once(self, price_snapshot):
+        """Test a repeated timestamp doesn't update the statistics again."""
+        from tools.alerts import AlertEngine
+
+        engine = AlertEngine()
+        engine.observe(price_snapshot("t0", 150.0))
+        engine.observe(price_snapshot("t0", 150.0))
+
+        assert engine._price_stats["Auckland"].count == 1
+
+    def test_low_renewables_with_hysteresis(self, generation_snapshot):
+        """Test low renewable share alerts once and clears above the band."""
+        from tools.alerts import AlertEngine, LOW_RENEWABLES
+
+        engine = AlertEngine(renewable_threshold=80.0, renewable_hysteresis=2.0)
+
+        alerts = engine.observe(generation_snapshot("t0", hydro=700, gas=300))
+        assert [alert.kind for alert in alerts] == [LOW_RENEWABLES]
+
+        engine.observe(generation_snapshot("t1", hydro=810, gas=190))
+        assert len(engine.active_alerts()) == 1
+
+        engine.observe(generation_snapshot("t2", hydro=900, gas=100))
+        assert engine.active_alerts() == []
+
+    def test_alerts_pushed_to_subscribers(self, generation_snapshot):
+        """Test each subscriber receives new alerts once."""
+        from tools.alerts import AlertEngine
+
+        engine = AlertEngine()
+        first = engine.subscribe()
+        second = engine.subscribe()
+
+        engine.observe(generation_snapshot("t0", hydro=500, gas=500))
+
+        assert len(first.drain()) == 1
+        assert first.drain() == []
+        assert len(second.drain()) == 1
+
+    def test_engine_fed_by_data_context(self, generation_payload, price_payload, em6_get):
+        """Test fetched snapshots reach the shared engine and the mock agent reports them."""
+        import asyncio
+        from tools.alerts import get_alert_engine
+        from agents.mock_electricity_agent import create_mock_electricity_agent
+
+        engine = get_alert_engine()
+        subscription = engine.subscribe()
+
+        generation_payload.update(
+            timestamp="2025-07-30T18:00:00Z",
+            total_generation_mw=1000,
+            generation_by_type={"hydro": 600, "gas": 400}
+        )
+        price_payload["timestamp"] = "2025-07-30T18:00:00Z"
+
+        async def ask():
+            agent = await create_mock_electricity_agent()
+            return await agent.query("Is the price spiking right now?")
+
+        with patch('httpx.get', side_effect=em6_get):
+            response = asyncio.run(ask())
+
+        assert "Renewable share dropped to 60.0%" in response
+        assert any(alert.kind == "low_renewables" for alert in subscription.drain())
+
+    def test_is_current_tracks_trading_period(self, price_snapshot, generation_snapshot):
+        """Test the engine is current only once prices and generation were seen this period."""
+        from tools.alerts import AlertEngine
+        from tools.history import TRADING_PERIOD_SECONDS
+
+        engine = AlertEngine()
+        assert not engine.is_current()
+
+        engine.observe(price_snapshot("t0", 150.0))
+        assert not engine.is_current()
+        engine.observe(generation_snapshot("t0", hydro=900, gas=100))
+
+        assert engine.is_current()
+        assert engine.last_checked() == "t0"
+        assert not engine.is_current(now=time.time() + TRADING_PERIOD_SECONDS)
+
+    def test_repeat_alert_questions_skip_fetch(self, em6_get):
+        """Test alert questions within a trading period are answered without fetching again."""
+        import asyncio
+        from agents.mock_electricity_agent import create_mock_electricity_agent
+
+        async def ask():
+            agent = await create_mock_electricity_agent()
+            first = await agent.query("Is the price spiking right now?")
+            second = await agent.query("Any market alerts?")
+            return first, second
+
+        with patch('httpx.get', side_effect=em6_get) as mock_get:
+            first, second = asyncio.run(ask())
+
+        # prices and generation once, for the first question only
+        assert mock_get.call_count == 2
+        assert first == second
+        assert "No active market alerts" in first
+
+    @pytest.mark.asyncio
+    async def test_batch_alert_template(self, em6_get):
+        """Test batch alert questions are answered from the engine state."""
+        from agents.batch import query_many
+        from agents.pool import AgentPool
+
+        async def factory():
+            raise AssertionError("alert questions shouldn't need an agent")
+
+        with patch('httpx.get', side_effect=em6_get) as mock_get:
+            results = await query_many(
+                ["Is the price spiking right now?", "Are there any market alerts?"],
+                AgentPool(factory, size=1)
+            )
+            await query_many(["Is the price spiking right now?"], AgentPool(factory, size=1))
+
+        assert [result.source for result in results] == ["template", "template"]
+        assert "No active market alerts" in results[0].answer
+        assert mock_get.call_count == 2
@@ -0,0 +1,133 @@
+import pytest
+import asyncio
+import time
+from unittest.mock import patch
+
+# Tests for batch queries answered from one snapshot
+
+
+class SlowAgent:
+    """Agent double that takes a fixed time per question."""
+
+    delay = 0.05
+
+    async def query(self, question: str) -> str:
+        await asyncio.sleep(self.delay)
+        return f"LLM: {question}"
+
+    def reset(self):
+        pass
+
+
+class TestMatchTemplate:
+    """Test which questions are answered from the snapshot."""
+
+    @pytest.mark.parametrize("question, endpoint", [
+        ("What's the spot price in Auckland?", "spot_prices"),
+        ("Show me the spot prices by region", "spot_prices"),
+        ("What share of generation is wind?", "generation"),
+        ("What percentage of energy is renewable?", "generation"),
+        ("What's the carbon intensity right now?", "carbon_emissions"),
+        ("What is the total power generation?", "generation"),
+        ("How much solar power is being generated?", "generation"),
+        ("Current carbon intensity?", "carbon_emissions"),
+        ("Is the price spiking right now?", "alerts"),
+        ("Are there any market alerts?", "alerts"),
+    ])
+    def test_template_questions(self, question, endpoint):
+        """Test simple lookups match a template."""
+        from agents.batch import match_template
+
+        assert match_template(question)[0] == endpoint
+
+    @pytest.mark.parametrize("question", [
+        "Compare hydro vs wind generation",
+        "Why are prices high in Auckland?",
+        "Will prices go up this evening?",
+        "How do Auckland and Dunedin prices differ?",
+        "Are prices going up this evening?",
+        "Which region has the cheapest price?",
+        "What is the highest spot price right now?",
+        "Is hydro generation increasing?",
+        "Is wind generation dropping right now?",
+        "Why is the price spiking?",
+        "Is it renewable?",
+        "Tell me something interesting",
+    ])
+    def test_llm_questions(self, question):
+        """Test comparative or open questions go to the LLM."""
+        from agents.batch import match_template
+
+        assert match_template(question) is None
+
+
+class TestQueryMany:
+    """Test answering a batch from one snapshot."""
+
+    @pytest.mark.asyncio
+    async def test_results_in_order_with_single_fetch(self, em6_get):
+        """Test results keep order and each endpoint is fetched once."""
+        from agents.batch import query_many
+        from agents.pool import AgentPool
+
+        async def factory():
+            return SlowAgent()
+
+        questions = [
+            "What's the spot price in Auckland?",
+            "Why are prices high?",
+            "What's the spot price in Dunedin?",
+            "What share of generation is hydro?",
+            "What's the carbon intensity right now?",
+        ]
+
+        with patch('httpx.get', side_effect=em6_get) as mock_get:
+            results = await query_many(questions, AgentPool(factory, size=2))
+
+        assert [result.question for result in results] == questions
+        assert [result.source for result in results] == ["template", "llm", "template", "template", "template"]
+        assert "$150.50/MWh" in results[0].answer
+        assert "$143.90/MWh" in results[2].answer
+        assert "3000 MW, 60.0%" in results[3].answer
+        assert "82 gCO₂/kWh" in results[4].answer
+        assert results[1].answer == "LLM: Why are prices high?"
+        assert all(result.elapsed_ms >= 0 for result in results)
+        # prices, generation and emissions - one request each
+        assert mock_get.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_llm_questions_run_in_parallel(self):
+        """Test a batch takes about as long as its slowest question."""
+        from agents.batch import query_many
+        from agents.pool import AgentPool
+
+        async def factory():
+            return SlowAgent()
+
+        questions = [f"Why is question {index} interesting?" for index in range(4)]
+
+        started = time.perf_counter()
+        results = await query_many(questions, AgentPool(factory, size=4))
+        elapsed = time.perf_counter() - started
+
+        assert all(result.source == "llm" for result in results)
+        assert elapsed < SlowAgent.delay * 3
+
+    @pytest.mark.asyncio
+    async def test_mock_agent_query_many(self, em6_get):
+        """Test the mock agent answers a report from one set of fetches."""
+        from agents.mock_electricity_agent import create_mock_electricity_agent
+
+        agent = await create_mock_electricity_agent()
+
+        with patch('httpx.get', side_effect=em6_get) as mock_get:
+            results = await agent.query_many([
+                "What's the spot price in Wellington?",
+                "Compare hydro vs wind generation",
+                "What percentage of energy is renewable?",
+            ])
+
+        assert results[0].source == "template"
+        assert results[1].source == "llm"
+        assert "92.0%" in results[2].answer
+        assert mock_get.call_count == 3
@@ -0,0 +1,80 @@
+import pytest
+
+# Tests for downsampled chart specs
+
+np = pytest.importorskip("numpy")
+
+
+def _history(periods: int):
+    from tools.history import MarketHistory, period_start
+    from tools.snapshots import GenerationSnapshot, PriceSnapshot
+
+    history = MarketHistory(capacity=periods)
+    for period in range(periods):
+        timestamp = period_start(1_000_000 + period)
+        history.observe(GenerationSnapshot.from_dict({
+            "timestamp": timestamp,
+            "total_generation_mw": 5000,
+            "generation_by_type": {"hydro": 3000 + period % 48, "wind": 800 - period % 7, "gas": 400}
+        }))
+        history.observe(PriceSnapshot.from_dict({
+            "timestamp": timestamp,
+            "prices": {"Auckland": 150.0 + period % 5, "Dunedin": 140.0}
+        }))
+    return history
+
+
+class TestLttb:
+    """Test shape-preserving downsampling."""
+
+    def test_keeps_endpoints_and_extremes(self):
+        """Test LTTB keeps the first, last and peak points."""
+        from tools.charts import lttb
+
+        x = np.arange(1000, dtype=float)
+        y = np.sin(x / 50)
+        y[637] = 10.0
+
+        kept = lttb(x, y, 100)
+
+        assert len(kept) == 100
+        assert kept[0] == 0 and kept[-1] == 999
+        assert 637 in kept
+        assert np.all(np.diff(kept) > 0)
+
+    def test_short_series_unchanged(self):
+        """Test series shorter than the threshold are kept whole."""
+        from tools.charts import lttb
+
+        assert lttb(np.arange(5), np.arange(5), 100).tolist() == [0, 1, 2, 3, 4]
+
+
+class TestChartForQuestion:
+    """Test chart specs built for chat answers."""
+
+    def test_generation_chart_downsampled_to_width(self):
+        """Test a week of hydro vs wind is reduced to the chart width."""
+        from tools.charts import chart_for_question
+
+        spec = chart_for_question("Show hydro vs wind this week", _history(336), width=120)
+
+        values = spec["data"]["values"]
+        assert {value["series"] for value in values} == {"hydro", "wind"}
+        assert sum(value["series"] == "hydro" for value in values) == 120
+        assert spec["encoding"]["y"]["title"] == "MW"
+
+    def test_price_chart_for_region(self):
+        """Test price questions chart the named region."""
+        from tools.charts import chart_for_question
+
+        spec = chart_for_question("Plot the Auckland spot price today", _history(100))
+
+        assert {value["series"] for value in spec["data"]["values"]} == {"Auckland"}
+        assert len(spec["data"]["values"]) == 48
+
+    def test_no_chart_for_plain_questions_or_short_history(self):
+        """Test charts are only built when asked for and history exists."""
+        from tools.charts import chart_for_question
+
+        assert chart_for_question("What is the current power generation?", _history(10)) is None
+        assert chart_for_question("Show hydro vs wind", _history(1)) is None
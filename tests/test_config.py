@@ -0,0 +1,39 @@
+import pytest
+
+# Tests for environment-driven settings
+
+
+class TestSettings:
+    """Test Settings.from_env."""
+
+    def test_defaults(self, monkeypatch):
+        """Test unset variables fall back to the built-in defaults."""
+        from config import EM6_BASE_URL, Settings
+
+        monkeypatch.delenv("EM6_API_URL", raising=False)
+
+        assert Settings.from_env().em6_base_url == EM6_BASE_URL
+
+    def test_api_urls_from_env(self, monkeypatch):
+        """Test API endpoints are read from the documented variables."""
+        from config import Settings
+
+        monkeypatch.setenv("EM6_API_URL", "https://em6.example.test/v2/")
+        monkeypatch.setenv("EMI_API_URL", "https://emi.example.test")
+
+        settings = Settings.from_env()
+
+        assert settings.em6_base_url == "https://em6.example.test/v2"
+        assert settings.emi_base_url == "https://emi.example.test"
+
+    def test_service_address_from_env(self, monkeypatch):
+        """Test the query service host and port come from settings."""
+        from config import Settings
+
+        monkeypatch.setenv("SERVICE_HOST", "127.0.0.1")
+        monkeypatch.setenv("SERVICE_PORT", "9000")
+
+        settings = Settings.from_env()
+
+        assert settings.service_host == "127.0.0.1"
+        assert settings.service_port == 9000
@@ -0,0 +1,85 @@
+import pytest
+from unittest.mock import patch
+import asyncio
+
+# Tests for the request-scoped data context
+
+
+class TestDataContext:
+    """Test per-turn memoization of electricity endpoints."""
+
+    def test_context_memoizes_endpoints(self, generation_payload):
+        """Test each endpoint is fetched once per context."""
+        from tools.data_context import data_context
+
+        with patch('httpx.get') as mock_get:
+            mock_get.return_value.json.return_value = generation_payload
+            mock_get.return_value.status_code = 200
+
+            with data_context() as context:
+                first = context.generation()
+                context.generation_breakdown()
+                context.renewable_percentage()
+                second = context.generation()
+
+            assert mock_get.call_count == 1
+            assert first is second
+
+    def test_nested_context_is_shared(self):
+        """Test nested contexts reuse the outer snapshot."""
+        from tools.data_context import data_context, get_data_context, current_data_context
+
+        with data_context() as outer:
+            with data_context() as inner:
+                assert inner is outer
+            assert get_data_context() is outer
+
+        assert current_data_context() is None
+
+    def test_tools_share_snapshot_within_turn(self, generation_payload):
+        """Test agent tools called in one turn share a single fetch."""
+        from tools.data_context import data_context
+        from agents.electricity_agent import (
+            fetch_current_generation,
+            calculate_renewable_percentage,
+            fetch_generation_breakdown
+        )
+
+        with patch('httpx.get') as mock_get:
+            mock_get.return_value.json.return_value = generation_payload
+            mock_get.return_value.status_code = 200
+
+            with data_context():
+                fetch_current_generation()
+                assert calculate_renewable_percentage() == 92.0
+                breakdown = fetch_generation_breakdown()
+
+            assert mock_get.call_count == 1
+            assert breakdown["breakdown"]["hydro"]["percentage"] == 60.0
+
+    def test_context_visible_in_worker_threads(self):
+        """Test tools run via asyncio.to_thread see the turn's context."""
+        from tools.data_context import data_context, current_data_context
+
+        async def run():
+            with data_context() as context:
+                seen = await asyncio.to_thread(current_data_context)
+                return context, seen
+
+        context, seen = asyncio.run(run())
+
+        assert seen is context
+
+    @pytest.mark.asyncio
+    async def test_mock_agent_fetches_each_endpoint_once(self, em6_get):
+        """Test a mock agent query makes one request per endpoint."""
+        from agents.mock_electricity_agent import create_mock_electricity_agent
+
+        agent = await create_mock_electricity_agent()
+
+        with patch('httpx.get', side_effect=em6_get) as mock_get:
+            response = await agent.query("What is the current power generation?")
+
+        # generation, prices and emissions - generation is no longer refetched
+        assert mock_get.call_count == 3
+        assert "5000 MW" in response
@@ -0,0 +1,167 @@
+import pytest
+import time
+from unittest.mock import patch
+
+# Tests for market history and forecasting
+
+np = pytest.importorskip("numpy")
+
+
+class TestMarketHistory:
+    """Test per-trading-period history."""
+
+    def test_trading_period(self):
+        """Test timestamps map to half-hour trading periods."""
+        from tools.history import trading_period, period_start
+
+        first = trading_period("2025-07-30T12:00:00Z")
+
+        assert trading_period("2025-07-30T12:29:59Z") == first
+        assert trading_period("2025-07-30T12:30:00Z") == first + 1
+        assert period_start(first) == "2025-07-30T12:00:00Z"
+        assert trading_period("not a timestamp") is None
+
+    def test_matrix_one_value_per_period_with_gaps_filled(self, price_snapshot):
+        """Test later snapshots replace earlier ones and gaps are forward-filled."""
+        from tools.history import MarketHistory
+
+        history = MarketHistory()
+        assert history.observe(price_snapshot(100, 150.0))
+        assert not history.observe(price_snapshot(100, 155.0))
+        history.observe(price_snapshot(102, 170.0))
+
+        periods, regions, matrix = history.price_matrix()
+
+        assert periods.tolist() == [100, 101, 102]
+        assert regions == ["Auckland", "Wellington"]
+        assert matrix[0].tolist() == [155.0, 155.0, 170.0]
+
+    def test_capacity_is_bounded(self, generation_snapshot):
+        """Test the ring buffer drops the oldest periods."""
+        from tools.history import MarketHistory
+
+        history = MarketHistory(capacity=3)
+        for period in range(10):
+            history.observe(generation_snapshot(period, hydro=3000, wind=800))
+
+        periods, _ = history.demand_series()
+
+        assert periods.tolist() == [7, 8, 9]
+
+
+class TestForecast:
+    """Test vectorized forecasting and the cached table."""
+
+    def test_holt_follows_trend(self):
+        """Test exponential smoothing extends a rising series upward."""
+        from tools.forecast import holt_forecast
+
+        matrix = np.array([np.arange(10) * 5.0 + 100, np.full(10, 50.0)])
+
+        forecast = holt_forecast(matrix, horizon=4)
+
+        assert forecast.shape == (2, 4)
+        assert np.all(np.diff(forecast[0]) > 0)
+        assert forecast[0, 0] > 145.0
+        assert np.allclose(forecast[1], 50.0)
+
+    def test_seasonal_naive_repeats_yesterday(self):
+        """Test seasonal-naive reuses the same period one day earlier."""
+        from tools.forecast import forecast_matrix
+        from tools.history import PERIODS_PER_DAY
+
+        day = np.arange(PERIODS_PER_DAY, dtype=float)
+        matrix = np.tile(day, 2)[None, :]
+
+        method, forecast = forecast_matrix(matrix, horizon=3)
+
+        assert method == "seasonal_naive"
+        assert forecast[0].tolist() == [0.0, 1.0, 2.0]
+
+    def test_forecaster_refreshes_once_per_period(self, price_snapshot, generation_snapshot):
+        """Test the table is recomputed in the background once per trading period."""
+        from tools.forecast import Forecaster, build_forecast_table
+        from tools.history import MarketHistory
+
+        history = MarketHistory()
+        forecaster = Forecaster(history, horizon=4)
+
+        with patch('tools.forecast.build_forecast_table', wraps=build_forecast_table) as build:
+            for period in range(5):
+                history.observe(price_snapshot(period, 150.0 + period * 10))
+                history.observe(generation_snapshot(period, hydro=3000, wind=800))
+                forecaster.refresh_in_background()
+                forecaster.refresh_in_background()
+                deadline = time.time() + 2
+                while forecaster._table_key != (period, period) and time.time() < deadline:
+                    time.sleep(0.005)
+
+        assert build.call_count == 5
+
+        started = time.perf_counter()
+        table = forecaster.table()
+        assert (time.perf_counter() - started) < 0.01
+
+        auckland = table["prices"]["Auckland"]
+        assert auckland["method"] == "holt"
+        assert len(auckland["values"]) == 4
+        assert auckland["values"][0] > auckland["last_value"]
+        assert table["demand"]["last_value"] == 3800
+
+    def test_table_fills_missing_section_without_waiting(self, price_snapshot, generation_snapshot):
+        """Test a cached table missing a series is rebuilt at once, not after the background refresh."""
+        import threading
+        from tools.forecast import Forecaster, build_forecast_table
+        from tools.history import MarketHistory
+
+        history = MarketHistory()
+        forecaster = Forecaster(history, horizon=4)
+        prices_arrived = threading.Event()
+        background_builds = []
+
+        def build(*args):
+            table = build_forecast_table(*args)
+            if threading.current_thread().name == "forecast-refresh":
+                background_builds.append(table)
+                if len(background_builds) == 1:
+                    # First build covers generation only; prices land before it is stored
+                    prices_arrived.wait(2)
+                else:
+                    time.sleep(0.5)
+            return table
+
+        with patch('tools.forecast.build_forecast_table', side_effect=build):
+            history.observe(generation_snapshot(100, hydro=3000, wind=800))
+            assert forecaster.refresh_in_background()
+            history.observe(price_snapshot(100, 150.0))
+            assert not forecaster.refresh_in_background()
+            prices_arrived.set()
+            deadline = time.time() + 2
+            while forecaster._table is None and time.time() < deadline:
+                time.sleep(0.005)
+
+            started = time.perf_counter()
+            table = forecaster.table()
+            elapsed = time.perf_counter() - started
+            cached = forecaster.table()
+
+        assert background_builds[0]["prices"] == {}
+        assert table["prices"]["Auckland"]["last_value"] == 150.0
+        assert elapsed < 0.2
+        assert cached["prices"]
+
+    def test_mock_agent_answers_forecast_question(self):
+        """Test the mock agent answers forecast questions from the table."""
+        import asyncio
+        from agents.mock_electricity_agent import create_mock_electricity_agent
+
+        async def ask():
+            agent = await create_mock_electricity_agent()
+            return await agent.query("Will prices go up this evening?")
+
+        with patch('httpx.get') as mock_get:
+            mock_get.return_value.status_code = 500
+            response = asyncio.run(ask())
+
+        assert "Spot price forecast" in response
+        assert "Auckland" in response
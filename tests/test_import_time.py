@@ -0,0 +1,86 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+
+# Cold-start budget tests: import each entry module in a fresh interpreter
+
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+# Cumulative import budget for the app's own lightweight modules, in milliseconds
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "150"))
+
+HEAVY_DEPENDENCIES = ("httpx", "dotenv", "strands", "numpy")
+OWN_PACKAGES = ("config", "tools", "agents", "ui")
+
+
+def _cold_import(module: str):
+    """
+    Import ``module`` in a fresh interpreter with ``-X importtime``.
+
+    Returns:
+        Tuple of (cumulative import time in ms by module name, loaded module names)
+    """
+    env = dict(os.environ, PYTHONPATH=str(SRC_DIR))
+    result = subprocess.run(
+        [
+            sys.executable, "-X", "importtime", "-c",
+            f"import sys, {module}; print(' '.join(sys.modules))"
+        ],
+        cwd=SRC_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative) / 1000
+
+    return times, set(result.stdout.split())
+
+
+def _report(module: str, times) -> str:
+    """Format per-module import times for the app's own modules."""
+    rows = [
+        f"  {name:<40} {ms:8.1f} ms"
+        for name, ms in sorted(times.items(), key=lambda item: -item[1])
+        if name.split(".")[0] in OWN_PACKAGES
+    ]
+    return f"Import times for {module}:\n" + "\n".join(rows)
+
+
+class TestImportTime:
+    """Test cold start stays fast and defers heavy dependencies."""
+
+    @pytest.mark.parametrize("module", [
+        "config",
+        "tools.electricity_api",
+        "tools.data_context",
+        "agents.mock_electricity_agent"
+    ])
+    def test_core_modules_within_budget(self, module):
+        """Test core modules import without heavy dependencies and within budget."""
+        times, loaded = _cold_import(module)
+        report = _report(module, times)
+        print(report)
+
+        assert not loaded.intersection(HEAVY_DEPENDENCIES), report
+        assert times[module] <= IMPORT_BUDGET_MS, report
+
+    def test_chat_interface_defers_agent(self):
+        """Test the UI module doesn't import the agent stack until first query."""
+        pytest.importorskip("streamlit")
+
+        times, loaded = _cold_import("ui.chat_interface")
+        report = _report("ui.chat_interface", times)
+        print(report)
+
+        assert "agents.mock_electricity_agent" not in loaded, report
+        assert not loaded.intersection(HEAVY_DEPENDENCIES), report
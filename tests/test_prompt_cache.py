@@ -0,0 +1,149 @@
+import pytest
+from typing import Any, Dict, List
+
+from strands.models import Model
+
+# Tests for the cacheable prompt prefix and per-turn usage instrumentation
+
+
+class StubModel(Model):
+    """Model client that records each request and reports canned usage."""
+
+    def __init__(self, prefix_tokens: int = 1200, turn_tokens: int = 40):
+        self.prefix_tokens = prefix_tokens
+        self.turn_tokens = turn_tokens
+        self.calls: List[Dict[str, Any]] = []
+
+    def update_config(self, **model_config: Any):
+        pass
+
+    def get_config(self) -> Dict[str, Any]:
+        return {}
+
+    async def structured_output(self, output_model, prompt, system_prompt=None, **kwargs):
+        pytest.fail("structured_output not used")
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None, **kwargs):
+        self.calls.append({"system_prompt": system_prompt, "tool_specs": tool_specs})
+        # The first call writes the prefix to the cache, later calls read it
+        cached = {"cacheReadInputTokens": self.prefix_tokens} if len(self.calls) > 1 else {
+            "cacheWriteInputTokens": self.prefix_tokens
+        }
+        yield {"messageStart": {"role": "assistant"}}
+        yield {"contentBlockDelta": {"delta": {"text": "Generation is 5000 MW."}}}
+        yield {"contentBlockStop": {}}
+        yield {"messageStop": {"stopReason": "end_turn"}}
+        yield {
+            "metadata": {
+                "usage": {
+                    "inputTokens": self.turn_tokens,
+                    "outputTokens": 8,
+                    "totalTokens": self.prefix_tokens + self.turn_tokens + 8,
+                    **cached
+                },
+                "metrics": {"latencyMs": 10}
+            }
+        }
+
+
+class TestPromptCache:
+    """Test the stable prompt prefix and cached-token reporting."""
+
+    @pytest.mark.asyncio
+    async def test_prefix_is_identical_across_calls_and_agents(self):
+        """Test every call sends the same system prompt and tool specs."""
+        from agents.electricity_agent import ElectricityAgent, SYSTEM_PROMPT
+
+        model = StubModel()
+        first = ElectricityAgent(model=model)
+        second = ElectricityAgent(model=model)
+        await first.initialize()
+        await second.initialize()
+
+        await first.query("What is the current generation?")
+        await first.query("And the spot prices?")
+        await second.query("Is it renewable?")
+
+        assert len(model.calls) == 3
+        assert all(call["system_prompt"] == SYSTEM_PROMPT for call in model.calls)
+        assert model.calls[0]["tool_specs"] == model.calls[1]["tool_specs"] == model.calls[2]["tool_specs"]
+        assert [spec["name"] for spec in model.calls[0]["tool_specs"]] == [t.tool_name for t in first.tools]
+        assert first.prefix_fingerprint() == second.prefix_fingerprint()
+
+    @pytest.mark.asyncio
+    async def test_last_usage_splits_cached_and_uncached_input(self):
+        """Test per-turn usage reports cache writes, then cache reads."""
+        from agents.electricity_agent import ElectricityAgent
+
+        agent = ElectricityAgent(model=StubModel(prefix_tokens=1200, turn_tokens=40))
+        await agent.initialize()
+
+        await agent.query("What is the current generation?")
+        usage = agent.last_usage
+        assert usage.cache_write_input_tokens == 1200
+        assert usage.cache_read_input_tokens == 0
+        assert usage.input_tokens == 40
+
+        await agent.query("And the spot prices?")
+        usage = agent.last_usage
+        assert usage.cache_read_input_tokens == 1200
+        assert usage.cache_write_input_tokens == 0
+        assert usage.input_tokens == 40
+        assert usage.output_tokens == 8
+        assert usage.model_calls == 1
+        assert usage.to_dict()["cached_input_ratio"] == round(1200 / 1240, 3)
+
+        assert agent.usage.totals.model_calls == 2
+        assert agent.usage.totals.total_input_tokens == 2 * 1240
+
+    @pytest.mark.asyncio
+    async def test_streamed_turn_records_usage(self):
+        """Test streaming answers are instrumented too."""
+        from agents.electricity_agent import ElectricityAgent
+
+        agent = ElectricityAgent(model=StubModel())
+        await agent.initialize()
+
+        chunks = [chunk async for chunk in agent.stream("What is the current generation?")]
+
+        assert "".join(chunks) == "Generation is 5000 MW."
+        assert agent.last_usage.cache_write_input_tokens == 1200
+
+    @pytest.mark.asyncio
+    async def test_prefix_sent_meets_caching_minimum(self):
+        """Test the system prompt and tool specs actually sent are long enough to be cached."""
+        import json
+        from agents.electricity_agent import CHARS_PER_TOKEN, MIN_CACHEABLE_PREFIX_TOKENS, ElectricityAgent
+
+        model = StubModel()
+        agent = ElectricityAgent(model=model)
+        await agent.initialize()
+        await agent.query("What is the current generation?")
+
+        sent = model.calls[0]
+        prefix_chars = len(sent["system_prompt"]) + len(json.dumps(sent["tool_specs"], sort_keys=True))
+
+        assert prefix_chars // CHARS_PER_TOKEN >= MIN_CACHEABLE_PREFIX_TOKENS
+
+    def test_default_model_marks_prefix_cacheable(self):
+        """Test the default Bedrock model adds a cache point after the system prompt."""
+        from agents.electricity_agent import PROMPT_CACHE_TYPE, create_model
+
+        config = create_model().get_config()
+
+        assert config["cache_prompt"] == PROMPT_CACHE_TYPE
+        # The tool specs alone are below the minimum; the prompt's cache point covers them
+        assert not config.get("cache_tools")
+
+    def test_short_prefix_disables_caching(self, monkeypatch, caplog):
+        """Test caching is skipped, with a warning, when the prefix is below the minimum."""
+        from agents import electricity_agent
+        from config import get_settings
+
+        monkeypatch.setattr(electricity_agent, "SYSTEM_PROMPT", "You are an expert on New Zealand electricity data.")
+
+        with caplog.at_level("WARNING", logger="agents.electricity_agent"):
+            model = electricity_agent.create_model()
+
+        assert model == get_settings().model_id
+        assert "prompt caching disabled" in caplog.text
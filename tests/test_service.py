@@ -0,0 +1,178 @@
+import pytest
+import asyncio
+from unittest.mock import patch
+
+# Tests for the headless query service
+
+
+class StubAgent:
+    """Agent double that echoes questions and records resets."""
+
+    def __init__(self):
+        self.resets = 0
+
+    async def query(self, question: str) -> str:
+        await asyncio.sleep(0)
+        return f"Answer to: {question}"
+
+    async def stream(self, question: str):
+        for chunk in ("Answer ", "to: ", question):
+            yield chunk
+
+    def reset(self):
+        self.resets += 1
+
+
+async def _disconnecting_stream(app, fail_on: str):
+    """Call /query/stream directly, with a client that disconnects on the ``fail_on`` message."""
+    body = b'{"question": "Prices?"}'
+    scope = {
+        "type": "http", "asgi": {"version": "3.0", "spec_version": "2.4"}, "http_version": "1.1",
+        "method": "POST", "scheme": "http", "path": "/query/stream", "raw_path": b"/query/stream",
+        "query_string": b"", "root_path": "", "headers": [(b"content-type", b"application/json")],
+        "client": ("test", 1), "server": ("test", 80)
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message["type"] == fail_on:
+            raise OSError("client went away")
+
+    with pytest.raises(Exception):
+        await app(scope, receive, send)
+
+
+@pytest.fixture
+def client():
+    from starlette.testclient import TestClient
+    from service.server import create_app
+
+    async def factory():
+        return StubAgent()
+
+    app = create_app(agent_factory=factory, pool_size=2, max_concurrency=4)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+class TestQueryService:
+    """Test HTTP query, streaming and batch endpoints."""
+
+    def test_query(self, client):
+        """Test answering a single question."""
+        response = client.post("/query", json={"question": "What is the spot price?"})
+
+        assert response.status_code == 200
+        assert response.json()["answer"] == "Answer to: What is the spot price?"
+        assert "elapsed_ms" in response.json()
+
+    def test_query_requires_question(self, client):
+        """Test missing questions are rejected."""
+        assert client.post("/query", json={}).status_code == 400
+        assert client.post("/query", content=b"not json").status_code == 400
+
+    def test_query_stream(self, client):
+        """Test answers stream as server-sent events."""
+        with client.stream("POST", "/query/stream", json={"question": "Prices?"}) as response:
+            body = "".join(response.iter_text())
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert body.count("event: delta") == 3
+        assert body.rstrip().split("\n\n")[-1].startswith("event: done")
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("fail_on", ["http.response.start", "http.response.body"])
+    async def test_stream_disconnect_releases_slot_and_agent(self, fail_on):
+        """Test a client disconnecting before or during the stream frees its slot and agent."""
+        from service.server import create_app
+
+        agents = []
+
+        async def factory():
+            agents.append(StubAgent())
+            return agents[-1]
+
+        app = create_app(agent_factory=factory, pool_size=1, max_concurrency=1)
+
+        await _disconnecting_stream(app, fail_on)
+
+        assert not app.state.limiter._semaphore.locked()
+        assert app.state.pool._idle == agents
+        assert all(agent.resets == 1 for agent in agents)
+
+    def test_batch_preserves_order(self, client):
+        """Test batch results come back in request order."""
+        questions = [f"Question {index}" for index in range(6)]
+
+        response = client.post("/batch", json={"questions": questions})
+
+        assert response.status_code == 200
+        answers = [result["answer"] for result in response.json()["results"]]
+        assert answers == [f"Answer to: {question}" for question in questions]
+        assert client.get("/health").json()["agents_created"] <= 2
+
+    def test_batch_validation(self, client):
+        """Test malformed batches are rejected."""
+        assert client.post("/batch", json={"questions": []}).status_code == 400
+        assert client.post("/batch", json={"questions": [1, 2]}).status_code == 400
+
+    def test_mock_backend_end_to_end(self):
+        """Test the service answers with the mock agent backend."""
+        from starlette.testclient import TestClient
+        from service.server import create_app
+        from agents.mock_electricity_agent import create_mock_electricity_agent
+
+        app = create_app(agent_factory=create_mock_electricity_agent, pool_size=1)
+
+        with patch('httpx.get') as mock_get, TestClient(app) as test_client:
+            mock_get.return_value.status_code = 500
+            response = test_client.post("/query", json={"question": "Show me the spot prices"})
+
+        assert response.status_code == 200
+        assert "Auckland" in response.json()["answer"]
+
+
+class TestAgentPool:
+    """Test the shared agent pool and concurrency limiter."""
+
+    @pytest.mark.asyncio
+    async def test_pool_caps_agents_and_resets(self):
+        """Test the pool never creates more than its size and resets on release."""
+        from agents.pool import AgentPool
+
+        async def factory():
+            return StubAgent()
+
+        pool = AgentPool(factory, size=2)
+        in_use = []
+
+        async def use():
+            async with pool.acquire() as agent:
+                in_use.append(agent)
+                await asyncio.sleep(0.01)
+            return agent
+
+        agents = await asyncio.gather(*(use() for _ in range(5)))
+
+        assert pool.created == 2
+        assert len(set(map(id, agents))) == 2
+        assert sum(agent.resets for agent in set(agents)) == 5
+
+    @pytest.mark.asyncio
+    async def test_limiter_rejects_when_queue_full(self):
+        """Test requests beyond the concurrency limit and queue are rejected."""
+        from service.server import ConcurrencyLimiter, ServiceBusy
+
+        limiter = ConcurrencyLimiter(max_concurrency=1, max_waiting=0)
+
+        await limiter.acquire()
+        with pytest.raises(ServiceBusy):
+            await limiter.acquire()
+        limiter.release()
+        await limiter.acquire()
+        limiter.release()
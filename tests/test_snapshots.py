@@ -0,0 +1,105 @@
+import sys
+import json
+import pytest
+
+# Tests for compact electricity snapshot types
+
+
+def _dict_sizeof(obj) -> int:
+    """Deep size of a nested dict payload, excluding (interned) strings."""
+    if isinstance(obj, str):
+        return 0
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_dict_sizeof(value) for value in obj.values())
+    return size
+
+
+def _snapshot_sizeof(snapshot) -> int:
+    """Size of a snapshot and its buffers, excluding strings and shared key tuples."""
+    size = sys.getsizeof(snapshot)
+    for attr in type(snapshot).__slots__:
+        value = getattr(snapshot, attr)
+        if not isinstance(value, (str, tuple)):
+            size += sys.getsizeof(value)
+    return size
+
+
+class TestSnapshots:
+    """Test snapshot conversion and memory footprint."""
+
+    def test_generation_round_trip(self, generation_payload):
+        """Test generation snapshot converts back to the API payload."""
+        from tools.snapshots import GenerationSnapshot
+
+        snapshot = GenerationSnapshot.from_dict(generation_payload)
+
+        assert snapshot.to_dict() == generation_payload
+        assert snapshot.get("hydro") == 3000
+        assert snapshot.percentage("wind") == 16.0
+        assert snapshot.renewable_percentage() == 92.0
+        assert json.loads(json.dumps(snapshot.to_dict())) == generation_payload
+
+    def test_generation_breakdown_matches_tool(self, generation_payload):
+        """Test breakdown payload matches get_generation_by_fuel_type."""
+        from tools.snapshots import GenerationSnapshot
+
+        breakdown = GenerationSnapshot.from_dict(generation_payload).to_breakdown_dict()
+
+        assert breakdown["breakdown"]["hydro"] == {"mw": 3000, "percentage": 60.0}
+        assert breakdown["breakdown"]["solar"] == {"mw": 100, "percentage": 2.0}
+
+    def test_price_and_emissions_round_trip(self, price_payload, emissions_payload):
+        """Test price and emissions snapshots convert back to API payloads."""
+        from tools.snapshots import PriceSnapshot, EmissionsSnapshot
+
+        prices = PriceSnapshot.from_dict(price_payload)
+        emissions = EmissionsSnapshot.from_dict(emissions_payload)
+
+        assert prices.to_dict() == price_payload
+        assert prices.get("Auckland") == 150.50
+        assert prices.get("Hamilton") is None
+        assert emissions.to_dict() == emissions_payload
+
+    def test_whole_prices_serialize_as_ints(self):
+        """Test integer prices round-trip as ints, like generation values."""
+        from tools.snapshots import PriceSnapshot
+
+        payload = {"timestamp": "2025-07-30T12:00:00Z", "prices": {"Auckland": 150, "Dunedin": 143.9}}
+        prices = PriceSnapshot.from_dict(payload).to_dict()
+
+        assert prices == payload
+        assert isinstance(prices["prices"]["Auckland"], int)
+
+    def test_to_numpy(self, generation_payload, price_payload):
+        """Test NumPy conversion for analytics."""
+        np = pytest.importorskip("numpy")
+        from tools.snapshots import GenerationSnapshot, PriceSnapshot
+
+        generation = GenerationSnapshot.from_dict(generation_payload).to_numpy()
+        prices = PriceSnapshot.from_dict(price_payload).to_numpy()
+
+        assert generation.dtype == np.float64
+        assert generation.tolist() == [3000, 800, 700, 400, 100]
+        assert prices.mean() == pytest.approx(147.1)
+
+    def test_key_tuples_are_shared(self, generation_payload):
+        """Test snapshots with the same layout share their key tuple."""
+        from tools.snapshots import GenerationSnapshot
+
+        first = GenerationSnapshot.from_dict(generation_payload)
+        second = GenerationSnapshot.from_dict(generation_payload)
+
+        assert first.fuel_types is second.fuel_types
+
+    def test_memory_reduction(self, generation_payload, price_payload, emissions_payload):
+        """Test snapshots use well under half the memory of the nested dicts."""
+        from tools.snapshots import GenerationSnapshot, PriceSnapshot, EmissionsSnapshot
+
+        for payload, snapshot_type in [
+            (generation_payload, GenerationSnapshot),
+            (price_payload, PriceSnapshot),
+            (emissions_payload, EmissionsSnapshot)
+        ]:
+            snapshot = snapshot_type.from_dict(payload)
+            assert _snapshot_sizeof(snapshot) * 2 <= _dict_sizeof(payload)
@@ -42,6 +42,23 @@ class TestStreamlitUI:
             
             mock_chat.assert_called_once_with("user")
     
+    def test_display_message_with_chart(self):
+        """Test messages with a chart spec render it inline."""
+        from src.ui.chat_interface import display_message
+        
+        chart = {"mark": "line", "data": {"values": []}}
+        message = {"role": "assistant", "content": "Hydro vs wind", "chart": chart}
+        
+        with patch.object(st, 'chat_message') as mock_chat, \
+             patch.object(st, 'write'), \
+             patch.object(st, 'vega_lite_chart') as mock_chart:
+            
+            mock_chat.return_value.__enter__.return_value = MagicMock()
+            
+            display_message(message)
+            
+            mock_chart.assert_called_once_with(chart, use_container_width=True)
+    
     def test_process_user_input(self):
         """Test processing user input."""
         from src.ui.chat_interface import process_user_input
@@ -110,4 +127,53 @@ class TestStreamlitUI:
             calls = mock_messages.append.call_args_list
             assert calls[0][0][0]['content'] == "First message"
             assert calls[0][0][0]['role'] == "user"
-            assert calls[2][0][0]['role'] == "user"
\ No newline at end of file
+            assert calls[2][0][0]['role'] == "user"
+    
+    def test_history_window_renders_recent_messages(self):
+        """Test only the most recent page of messages is rendered."""
+        from src.ui.chat_interface import display_history, HISTORY_PAGE_SIZE
+        
+        mock_session = MagicMock()
+        mock_session.messages = [{"role": "user", "content": str(i)} for i in range(100)]
+        mock_session.history_window = HISTORY_PAGE_SIZE
+        
+        with patch.object(st, 'session_state', mock_session), \
+             patch.object(st, 'button', return_value=False) as mock_button, \
+             patch('src.ui.chat_interface.display_message') as mock_display:
+            
+            display_history()
+            
+            assert mock_display.call_count == HISTORY_PAGE_SIZE
+            assert mock_display.call_args_list[0][0][0]['content'] == str(100 - HISTORY_PAGE_SIZE)
+            assert "80 hidden" in mock_button.call_args[0][0]
+    
+    def test_load_earlier_expands_window(self):
+        """Test the load earlier control reveals another page."""
+        from src.ui.chat_interface import display_history, HISTORY_PAGE_SIZE
+        
+        mock_session = MagicMock()
+        mock_session.messages = [{"role": "user", "content": str(i)} for i in range(30)]
+        mock_session.history_window = HISTORY_PAGE_SIZE
+        
+        with patch.object(st, 'session_state', mock_session), \
+             patch.object(st, 'button', return_value=True), \
+             patch.object(st, 'rerun') as mock_rerun, \
+             patch('src.ui.chat_interface.display_message'):
+            
+            display_history()
+            
+            assert mock_session.history_window == 2 * HISTORY_PAGE_SIZE
+            mock_rerun.assert_called_once()
+    
+    def test_markdown_rendered_once_per_message(self):
+        """Test messages carry pre-rendered markdown with prices escaped."""
+        from src.ui.chat_interface import add_to_history
+        
+        mock_session = MagicMock()
+        mock_session.messages = []
+        
+        with patch.object(st, 'session_state', mock_session):
+            message = add_to_history("assistant", "Auckland: $150.50/MWh, Dunedin: $143.90/MWh")
+        
+        assert message["markdown"] == "Auckland: \\$150.50/MWh, Dunedin: \\$143.90/MWh"
+        assert mock_session.messages == [message]